@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+"""
+TAMV Quantum Engine coordinator/worker mode
+Distributes tasks from a TaskCoordinator to EngineWorkers over local sockets
+"""
+
+import asyncio
+import importlib.util
+import json
+import logging
+import math
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+ENGINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'quantum-processor.py')
+
+def _load_engine():
+    """The engine module, loaded by path as quantum-processor.py is not importable by name"""
+    engine = sys.modules.get('quantum_processor')
+    if engine is None:
+        spec = importlib.util.spec_from_file_location('quantum_processor', ENGINE_PATH)
+        engine = importlib.util.module_from_spec(spec)
+        sys.modules['quantum_processor'] = engine
+        spec.loader.exec_module(engine)
+    return engine
+
+engine = _load_engine()
+QuantumTask = engine.QuantumTask
+QuantumResult = engine.QuantumResult
+SecurityError = engine.SecurityError
+EthicalError = engine.EthicalError
+task_content_key = engine.task_content_key
+create_quantum_processor = engine.create_quantum_processor
+
+# Coordinator/worker mode. Engines connect to a TaskCoordinator over TCP
+# ('host:port') or a Unix socket ('unix:/path'), plus a second connection
+# carrying only heartbeats. Each frame is a '<II' prefix (header and body
+# lengths), a JSON header naming the message type, then an opaque body:
+# encoded task batches from the coordinator, binary QuantumResults from
+# workers. Neither side unpickles what it reads, so a peer on the socket
+# cannot make the other run code.
+_FRAME_PREFIX = struct.Struct('<II')
+
+# Task batch body: '<I' JSON header length, a JSON header holding the task
+# fields, then the raw data of arrays in task parameters, described in the
+# header by dtype, shape and offset as in the binary result format.
+_TASKS_PREFIX = struct.Struct('<I')
+_TASK_FIELDS = ('task_id', 'priority', 'max_qubits', 'shots', 'timeout', 'created_at')
+
+def _encode_tasks(tasks: List[QuantumTask]) -> List[bytes]:
+    arrays: List[np.ndarray] = []
+    encoded = [{
+        **{name: getattr(task, name) for name in _TASK_FIELDS},
+        'task_type': task.task_type.value,
+        'classical_data': engine._encode_payload(task.classical_data, arrays),
+        'quantum_parameters': engine._encode_payload(task.quantum_parameters, arrays)
+    } for task in tasks]
+    
+    descriptors = []
+    offset = 0
+    for array in arrays:
+        if array.dtype.hasobject:
+            raise TypeError("Task parameters cannot hold object arrays")
+        descriptors.append({'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset})
+        offset += array.nbytes
+    header = json.dumps({'tasks': encoded, 'arrays': descriptors}).encode('utf-8')
+    return [_TASKS_PREFIX.pack(len(header)) + header] + [array.tobytes() for array in arrays]
+
+def _decode_tasks(body: bytes) -> List[QuantumTask]:
+    header_length, = _TASKS_PREFIX.unpack_from(body, 0)
+    data_start = _TASKS_PREFIX.size + header_length
+    header = json.loads(body[_TASKS_PREFIX.size:data_start])
+    arrays = []
+    for descriptor in header['arrays']:
+        dtype = np.dtype(descriptor['dtype'])
+        if dtype.hasobject:
+            raise ValueError("Task parameters cannot hold object arrays")
+        shape = tuple(descriptor['shape'])
+        count = int(np.prod(shape, dtype=np.int64))
+        array = np.frombuffer(body, dtype=dtype, count=count, offset=data_start + descriptor['offset'])
+        arrays.append(array.reshape(shape).copy())
+    
+    return [QuantumTask(
+        task_type=engine.QuantumComputationType(fields['task_type']),
+        classical_data=engine._decode_payload(fields['classical_data'], arrays),
+        quantum_parameters=engine._decode_payload(fields['quantum_parameters'], arrays),
+        **{name: fields[name] for name in _TASK_FIELDS}
+    ) for fields in header['tasks']]
+
+def _frame(header: Dict[str, Any], body_length: int = 0) -> bytes:
+    encoded = json.dumps(header).encode('utf-8')
+    return _FRAME_PREFIX.pack(len(encoded), body_length) + encoded
+
+async def _read_frame(reader: asyncio.StreamReader) -> tuple:
+    header_length, body_length = _FRAME_PREFIX.unpack(await reader.readexactly(_FRAME_PREFIX.size))
+    header = json.loads(await reader.readexactly(header_length))
+    body = await reader.readexactly(body_length) if body_length else b''
+    return header, body
+
+async def _open_connection(address: str) -> tuple:
+    if address.startswith('unix:'):
+        return await asyncio.open_unix_connection(address[len('unix:'):])
+    host, port = address.rsplit(':', 1)
+    return await asyncio.open_connection(host, int(port))
+
+def _connect(address: str) -> socket.socket:
+    """Blocking counterpart of _open_connection"""
+    if address.startswith('unix:'):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(address[len('unix:'):])
+        return sock
+    host, port = address.rsplit(':', 1)
+    return socket.create_connection((host, int(port)))
+
+@dataclass
+class _WorkerState:
+    """Coordinator-side view of one connected worker"""
+    worker_id: str
+    capabilities: Dict[str, Any]
+    writer: asyncio.StreamWriter
+    last_seen: float
+    # Tasks placed with this worker but not yet handed out, oldest first
+    queue: deque = field(default_factory=deque)
+    running: set = field(default_factory=set)
+    # Slots asked for by the worker's outstanding pull, if any
+    requested: int = 0
+    completed: int = 0
+    alive: bool = True
+
+class TaskCoordinator:
+    """
+    Distributes tasks to engine workers that pull them over a socket
+    
+    Workers register their capabilities, then ask for tasks whenever they
+    have free slots. A submitted task is queued with a worker able to run
+    it, chosen by content key so identical tasks meet the same worker's
+    memo, or handed straight to an idle worker. A worker whose own queue
+    is empty steals from the back of the longest queue it can serve.
+    Workers heartbeat; one silent for ``heartbeat_timeout`` seconds, or
+    whose connection drops, is removed and its tasks are placed again, up
+    to ``max_attempts`` dispatches per task.
+    """
+    
+    def __init__(self, address: str = '127.0.0.1:0', heartbeat_timeout: float = 10.0,
+                 max_attempts: int = 3):
+        self.address = address
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_attempts = max_attempts
+        self.logger = logging.getLogger(__name__)
+        
+        self._server = None
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._connections: set = set()
+        self._heartbeat_writers: set = set()
+        self._workers: Dict[str, _WorkerState] = {}
+        self._workers_changed: Optional[asyncio.Condition] = None
+        self._tasks: Dict[str, QuantumTask] = {}
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._attempts: Dict[str, int] = {}
+        # Tasks no live worker can run yet
+        self._unplaced: deque = deque()
+        self.stats = {'submitted': 0, 'completed': 0, 'stolen': 0, 'reassigned': 0, 'lost': 0, 'workers_lost': 0}
+    
+    async def start(self) -> str:
+        """Start listening, returning the address workers should connect to"""
+        self._workers_changed = asyncio.Condition()
+        if self.address.startswith('unix:'):
+            self._server = await asyncio.start_unix_server(self._serve, self.address[len('unix:'):])
+        else:
+            host, port = self.address.rsplit(':', 1)
+            self._server = await asyncio.start_server(self._serve, host, int(port))
+            self.address = f"{host}:{self._server.sockets[0].getsockname()[1]}"
+        self._monitor_task = asyncio.get_running_loop().create_task(self._monitor())
+        self.logger.info(f"Task coordinator listening on {self.address}")
+        return self.address
+    
+    async def stop(self):
+        """Shut down connected workers and stop listening; unfinished tasks are cancelled"""
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            self._monitor_task = None
+        for worker in list(self._workers.values()):
+            worker.writer.write(_frame({'type': 'shutdown'}))
+            worker.alive = False
+            worker.writer.close()
+        self._workers.clear()
+        for writer in self._heartbeat_writers:
+            writer.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+    
+    def submit(self, task: QuantumTask) -> asyncio.Future:
+        """Queue a task, returning a future for its QuantumResult"""
+        future = self._futures.get(task.task_id)
+        if future is not None:
+            return future
+        # Fail here rather than at dispatch if the task cannot be sent
+        _encode_tasks([task])
+        future = self._futures[task.task_id] = asyncio.get_running_loop().create_future()
+        self._tasks[task.task_id] = replace(task, strategy_decision=None, backend_override=None)
+        self._attempts[task.task_id] = 0
+        self.stats['submitted'] += 1
+        self._place(task.task_id)
+        return future
+    
+    async def run(self, task: QuantumTask) -> QuantumResult:
+        return await self.submit(task)
+    
+    async def wait_for_workers(self, count: int, timeout: Optional[float] = None):
+        """Wait until at least ``count`` workers are registered"""
+        async with self._workers_changed:
+            await asyncio.wait_for(
+                self._workers_changed.wait_for(lambda: len(self._workers) >= count), timeout
+            )
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'pending': len(self._futures),
+            'unplaced': len(self._unplaced),
+            'workers': {
+                worker.worker_id: {
+                    'queued': len(worker.queue),
+                    'running': len(worker.running),
+                    'completed': worker.completed,
+                    'capabilities': worker.capabilities
+                }
+                for worker in self._workers.values()
+            }
+        }
+    
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        try:
+            await self._handle_worker(reader, writer)
+        finally:
+            self._connections.discard(connection)
+    
+    async def _handle_worker(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            header, _ = await _read_frame(reader)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            writer.close()
+            return
+        worker_id = header.get('worker_id')
+        capabilities = header.get('capabilities', {})
+        if not isinstance(worker_id, str) or not worker_id or not isinstance(capabilities, dict):
+            self.logger.warning(f"Closing connection with a malformed {header.get('type')!r} frame")
+            writer.close()
+            return
+        if header.get('type') == 'heartbeat':
+            await self._receive_heartbeats(worker_id, reader, writer)
+            return
+        if header.get('type') != 'register':
+            writer.close()
+            return
+        
+        worker = _WorkerState(worker_id, capabilities, writer, time.monotonic())
+        previous = self._workers.get(worker.worker_id)
+        if previous is not None:
+            self._remove_worker(previous, 'reconnected')
+        self._workers[worker.worker_id] = worker
+        self.logger.info(f"Worker {worker.worker_id} registered: {worker.capabilities}")
+        async with self._workers_changed:
+            self._workers_changed.notify_all()
+        
+        try:
+            while worker.alive:
+                header, body = await _read_frame(reader)
+                worker.last_seen = time.monotonic()
+                if header.get('type') == 'pull':
+                    worker.requested = header.get('slots', 1)
+                    self._dispatch(worker)
+                elif header.get('type') == 'result':
+                    self._complete(worker, QuantumResult.from_bytes(body))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._remove_worker(worker, 'disconnected')
+    
+    async def _receive_heartbeats(self, worker_id: str, reader: asyncio.StreamReader,
+                                  writer: asyncio.StreamWriter):
+        self._heartbeat_writers.add(writer)
+        try:
+            while True:
+                worker = self._workers.get(worker_id)
+                if worker is not None:
+                    worker.last_seen = time.monotonic()
+                await _read_frame(reader)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._heartbeat_writers.discard(writer)
+            writer.close()
+    
+    def _eligible(self, worker: _WorkerState, task: QuantumTask) -> bool:
+        task_types = worker.capabilities.get('task_types')
+        if task_types is not None and task.task_type.value not in task_types:
+            return False
+        return task.quantum_parameters.get('num_qubits', 0) <= worker.capabilities.get('max_qubits', math.inf)
+    
+    def _place(self, task_id: str):
+        task = self._tasks[task_id]
+        eligible = sorted(
+            (w for w in self._workers.values() if w.alive and self._eligible(w, task)),
+            key=lambda w: w.worker_id
+        )
+        if not eligible:
+            self._unplaced.append(task_id)
+            return
+        
+        home = eligible[int(task_content_key(task)[:8], 16) % len(eligible)]
+        idle = next((w for w in eligible if w.requested), None)
+        target = home if home.requested or idle is None else idle
+        target.queue.append(task_id)
+        if target.requested:
+            self._dispatch(target)
+    
+    def _next_task(self, worker: _WorkerState) -> Optional[str]:
+        if worker.queue:
+            return worker.queue.popleft()
+        for task_id in self._unplaced:
+            if self._eligible(worker, self._tasks[task_id]):
+                self._unplaced.remove(task_id)
+                return task_id
+        
+        victims = sorted(
+            (w for w in self._workers.values() if w is not worker and w.queue),
+            key=lambda w: len(w.queue), reverse=True
+        )
+        for victim in victims:
+            for task_id in reversed(victim.queue):
+                if self._eligible(worker, self._tasks[task_id]):
+                    victim.queue.remove(task_id)
+                    self.stats['stolen'] += 1
+                    return task_id
+        return None
+    
+    def _dispatch(self, worker: _WorkerState):
+        """Answer the worker's outstanding pull if there is anything for it to run"""
+        batch = []
+        while len(batch) < worker.requested:
+            task_id = self._next_task(worker)
+            if task_id is None:
+                break
+            batch.append(task_id)
+        if not batch:
+            return
+        
+        worker.requested = 0
+        for task_id in batch:
+            worker.running.add(task_id)
+            self._attempts[task_id] += 1
+        buffers = _encode_tasks([self._tasks[task_id] for task_id in batch])
+        worker.writer.write(_frame({'type': 'tasks', 'count': len(batch)}, sum(len(b) for b in buffers)))
+        worker.writer.writelines(buffers)
+    
+    def _complete(self, worker: _WorkerState, result: QuantumResult):
+        worker.running.discard(result.task_id)
+        worker.completed += 1
+        future = self._futures.pop(result.task_id, None)
+        if future is None:
+            return
+        del self._tasks[result.task_id]
+        del self._attempts[result.task_id]
+        self.stats['completed'] += 1
+        if not future.done():
+            future.set_result(result)
+    
+    def _remove_worker(self, worker: _WorkerState, reason: str):
+        if not worker.alive and self._workers.get(worker.worker_id) is not worker:
+            return
+        worker.alive = False
+        if self._workers.get(worker.worker_id) is worker:
+            del self._workers[worker.worker_id]
+        worker.writer.close()
+        
+        orphans = [task_id for task_id in list(worker.running) + list(worker.queue) if task_id in self._futures]
+        worker.running.clear()
+        worker.queue.clear()
+        if reason != 'reconnected':
+            self.stats['workers_lost'] += 1
+        self.logger.warning(f"Worker {worker.worker_id} removed ({reason}); placing {len(orphans)} tasks again")
+        
+        for task_id in orphans:
+            if self._attempts[task_id] >= self.max_attempts:
+                self._lose(task_id)
+            else:
+                self.stats['reassigned'] += 1
+                self._place(task_id)
+    
+    def _lose(self, task_id: str):
+        attempts = self._attempts.pop(task_id)
+        del self._tasks[task_id]
+        self.stats['lost'] += 1
+        future = self._futures.pop(task_id)
+        if not future.done():
+            future.set_result(QuantumResult(
+                task_id=task_id,
+                success=False,
+                quantum_result=None,
+                classical_result=None,
+                hybrid_result=None,
+                execution_time=0.0,
+                qubits_used=0,
+                shots_executed=0,
+                error_message=f"Task lost with its worker on each of {attempts} attempts"
+            ))
+    
+    async def _monitor(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_timeout / 4)
+            now = time.monotonic()
+            for worker in list(self._workers.values()):
+                if now - worker.last_seen > self.heartbeat_timeout:
+                    self._remove_worker(worker, 'heartbeat timeout')
+
+class EngineWorker:
+    """
+    Serves a TaskCoordinator with a local engine
+    
+    Runs up to ``slots`` tasks at once through ``processor``, pulling more
+    as slots free up. A thread heartbeats every ``heartbeat_interval``
+    seconds on its own connection, so a task that keeps the event loop
+    busy does not make the worker look dead.
+    """
+    
+    def __init__(self, processor: 'engine.QuantumClassicalHybridProcessor', address: str,
+                 worker_id: Optional[str] = None, slots: int = 1, heartbeat_interval: float = 1.0):
+        self.processor = processor
+        self.address = address
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.slots = slots
+        self.heartbeat_interval = heartbeat_interval
+        self.logger = logging.getLogger(__name__)
+        self.completed = 0
+        self._active: Dict[str, asyncio.Task] = {}
+        self._slot_freed = asyncio.Event()
+    
+    def capabilities(self) -> Dict[str, Any]:
+        return {
+            'max_qubits': self.processor.backend_registry.max_qubits,
+            'backends': sorted(self.processor.quantum_backends),
+            'slots': self.slots,
+            'memory_budget_bytes': self.processor.admission.budget_bytes,
+            'host': socket.gethostname()
+        }
+    
+    async def run(self):
+        """Serve until the coordinator shuts this worker down or the connection drops"""
+        reader, writer = await _open_connection(self.address)
+        writer.write(_frame({'type': 'register', 'worker_id': self.worker_id, 'capabilities': self.capabilities()}))
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(stop_heartbeat,), daemon=True,
+                                     name=f"heartbeat-{self.worker_id}")
+        heartbeat.start()
+        try:
+            while True:
+                while len(self._active) >= self.slots:
+                    self._slot_freed.clear()
+                    await self._slot_freed.wait()
+                writer.write(_frame({'type': 'pull', 'slots': self.slots - len(self._active)}))
+                await writer.drain()
+                
+                header, body = await _read_frame(reader)
+                if header['type'] == 'shutdown':
+                    break
+                for task in _decode_tasks(body):
+                    self._active[task.task_id] = asyncio.get_running_loop().create_task(self._execute(task, writer))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.logger.warning(f"Worker {self.worker_id} lost its coordinator connection")
+        finally:
+            stop_heartbeat.set()
+            for task in self._active.values():
+                task.cancel()
+            writer.close()
+    
+    async def _execute(self, task: QuantumTask, writer: asyncio.StreamWriter):
+        try:
+            try:
+                result = await self._process(task)
+                buffers = result.to_buffers()
+            except Exception as e:
+                # The coordinator waits on every task it hands out; always answer
+                result = self.processor._failure_result(task, e, 0.0)
+                buffers = result.to_buffers()
+            writer.write(_frame({'type': 'result', 'task_id': task.task_id}, sum(len(b) for b in buffers)))
+            writer.writelines(buffers)
+            await writer.drain()
+            self.completed += 1
+        except ConnectionError:
+            # The coordinator has dropped this worker and will place the task again
+            pass
+        finally:
+            self._active.pop(task.task_id, None)
+            self._slot_freed.set()
+    
+    async def _process(self, task: QuantumTask) -> QuantumResult:
+        # The coordinator does not validate, so each worker applies its own gates
+        security_check, ethical_assessment = await asyncio.gather(
+            self.processor.security_gate.verdict(task),
+            self.processor.ethics_gate.verdict(task)
+        )
+        if not security_check.approved:
+            error = SecurityError(f"Task rejected by security layer: {security_check.reason}")
+            return self.processor._failure_result(task, error, 0.0)
+        if not ethical_assessment.approved:
+            error = EthicalError(f"Task rejected by ethical core: {ethical_assessment.reason}")
+            return self.processor._failure_result(task, error, 0.0)
+        return await self.processor.process_task(task)
+    
+    def _heartbeat(self, stop: threading.Event):
+        beat = _frame({'type': 'heartbeat', 'worker_id': self.worker_id})
+        try:
+            with _connect(self.address) as sock:
+                sock.sendall(beat)
+                while not stop.wait(self.heartbeat_interval):
+                    sock.sendall(beat)
+        except OSError:
+            # The coordinator is gone; the main connection notices too
+            pass
+
+def run_engine_worker(address: str, config: Optional[Dict[str, Any]] = None, **options):
+    """Process entry point: serve the coordinator at ``address`` with a new engine"""
+    async def serve():
+        processor = create_quantum_processor(config or {})
+        await processor.start()
+        try:
+            await EngineWorker(processor, address, **options).run()
+        finally:
+            await processor.stop()
+    
+    asyncio.run(serve())
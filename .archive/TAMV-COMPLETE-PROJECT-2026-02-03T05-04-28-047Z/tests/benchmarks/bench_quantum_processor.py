@@ -0,0 +1,426 @@
+"""
+Benchmark suite for the quantum-classical hybrid processing engine.
+
+Runs seeded workloads on a CPU-only machine (no Qiskit, IBMQ or classical
+ML frameworks) and writes a JSON report. When a baseline report exists,
+every metric in it is compared with the new run and the suite exits with
+status 1 if any metric got worse by more than its tolerance.
+
+    python tests/benchmarks/bench_quantum_processor.py
+    python tests/benchmarks/bench_quantum_processor.py --quick --only simulation_scaling
+    python tests/benchmarks/bench_quantum_processor.py --update-baseline
+
+Each timing is the best of ``--repeats`` runs, as with timeit, since
+interference from other processes only ever adds time. Shared and
+frequency-scaled CPUs also drift in speed for seconds at a time, so a
+fixed calibration workload is timed around every benchmark, and a timing
+only counts as regressed if it is worse both in absolute terms and
+relative to the calibration. A benchmark that still looks regressed is
+run once more before the gate fails. Timings depend on the machine;
+record a baseline on the machine that runs the gate
+(``--update-baseline``) rather than comparing against another host's
+numbers.
+"""
+
+import argparse
+import asyncio
+import gc
+import importlib.util
+import json
+import os
+import pickle
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+MODULE_PATH = Path(__file__).resolve().parents[2] / "src" / "quantum-engine" / "quantum-processor.py"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+SUITE_VERSION = 1
+
+# Allowed relative regression per metric kind; timings are noisier than sizes
+DEFAULT_TOLERANCES = {"time": 0.30, "throughput": 0.30, "memory": 0.10}
+
+
+def load_quantum_processor():
+    """Load quantum-processor.py, whose file name is not importable directly."""
+    if "quantum_processor" not in sys.modules:
+        spec = importlib.util.spec_from_file_location("quantum_processor", MODULE_PATH)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["quantum_processor"] = module
+        spec.loader.exec_module(module)
+    return sys.modules["quantum_processor"]
+
+
+qp = load_quantum_processor()
+
+
+class BenchmarkEthicalCore:
+    """Deterministic stand-in for the Isabella core, doing a fixed amount of scoring work per call."""
+
+    async def process_data(self, data):
+        records = np.asarray(data.get("records", []), dtype=np.float64)
+        score = float(1.0 / (1.0 + np.abs(records - records.mean()).mean())) if records.size else 0.9
+        return {"ethical_score": score, "records": int(records.size), "flags": []}
+
+    async def process_classical_task(self, task):
+        result = await self.process_data(task.classical_data)
+        return {**result, "confidence": result["ethical_score"]}
+
+
+def metric(value, unit, kind, tolerance=None):
+    """One report entry; ``kind`` selects the regression direction and default tolerance."""
+    entry = {"value": float(value), "unit": unit, "kind": kind}
+    if tolerance is not None:
+        entry["tolerance"] = tolerance
+    return entry
+
+
+def make_processor(seed, **config):
+    return qp.create_quantum_processor({"seed": seed, "ethical_core": BenchmarkEthicalCore(), **config})
+
+
+def make_workload(seed, count):
+    """Seeded mix of simulation, QAOA and hybrid tasks, each with distinct content."""
+    rng = np.random.default_rng(seed)
+    kinds = rng.choice(["simulation", "optimization", "hybrid"], size=count, p=[0.4, 0.3, 0.3])
+    tasks = []
+    for i, kind in enumerate(kinds):
+        if kind == "simulation":
+            task = qp.QuantumTask(
+                f"sim-{i}", qp.QuantumComputationType.SIMULATION, {"instance": i},
+                {"num_qubits": int(rng.integers(4, 9)), "evolution_time": 0.3}
+            )
+        elif kind == "optimization":
+            task = qp.QuantumTask(
+                f"opt-{i}", qp.QuantumComputationType.OPTIMIZATION, {"instance": i},
+                {"num_qubits": int(rng.integers(3, 6)), "optimize": False}, max_qubits=10
+            )
+        else:
+            task = hybrid_task(f"hyb-{i}", rng)
+        tasks.append(task)
+    return tasks
+
+
+def hybrid_task(task_id, rng):
+    # processing_steps pushes classical complexity over 0.5, so the strategy is hybrid
+    return qp.QuantumTask(
+        task_id, qp.QuantumComputationType.MACHINE_LEARNING,
+        {"records": rng.normal(size=64).round(6).tolist(), "processing_steps": 60},
+        {"num_qubits": 4, "problem_size": 20}, max_qubits=10
+    )
+
+
+def bench_strategy_selection(seed, quick, repeats):
+    """Time to decide a task's processing strategy."""
+    processor = make_processor(seed)
+    tasks = make_workload(seed, 500 if quick else 2000)
+
+    def run():
+        started = time.perf_counter()
+        for task in tasks:
+            processor._decide_processing_strategy(task)
+        return (time.perf_counter() - started) / len(tasks)
+
+    samples = [run() for _ in range(repeats)]
+    return {"strategy_selection.decision": metric(min(samples) * 1e6, "us", "time")}
+
+
+def bench_queue_throughput(seed, quick, repeats):
+    """Tasks per second through submit_task and N queue consumers calling process_task."""
+    count = 60 if quick else 200
+    metrics = {}
+    for workers in (1, 2, 4):
+        samples = [asyncio.run(_drain_queue(seed, count, workers)) for _ in range(repeats)]
+        metrics[f"queue_throughput.workers_{workers}"] = metric(max(samples), "tasks/s", "throughput")
+    return metrics
+
+
+async def _drain_queue(seed, count, workers):
+    processor = make_processor(seed, anchor_batch_window=0.01)
+    tasks = make_workload(seed, count)
+
+    async def consume():
+        while True:
+            task = await processor.task_queue.get()
+            try:
+                result = await processor.process_task(task)
+                if not result.success:
+                    raise RuntimeError(f"Benchmark task {task.task_id} failed: {result.error_message}")
+            finally:
+                processor.task_queue.task_done()
+
+    consumers = [asyncio.create_task(consume()) for _ in range(workers)]
+    started = time.perf_counter()
+    try:
+        for task in tasks:
+            await processor.submit_task(task)
+        await processor.task_queue.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        for consumer in consumers:
+            consumer.cancel()
+        await asyncio.gather(*consumers, return_exceptions=True)
+        await processor.stop()
+    return count / elapsed
+
+
+def bench_simulation_scaling(seed, quick, repeats):
+    """Time to simulate a fixed-depth evolution circuit per backend and qubit count."""
+    processor = make_processor(seed)
+    sizes = {
+        "numpy_statevector": (4, 8, 12) if quick else (4, 8, 12, 16, 20),
+        "mps": (8, 16, 32) if quick else (8, 16, 32, 64)
+    }
+    metrics = {}
+    for backend_name, qubit_counts in sizes.items():
+        backend = processor.quantum_backends[backend_name]
+        for num_qubits in qubit_counts:
+            operations = qp._evolution_operations(num_qubits, 5)
+            samples = []
+            for _ in range(repeats):
+                started = time.perf_counter()
+                backend.run(num_qubits, operations)
+                samples.append(time.perf_counter() - started)
+            metrics[f"simulation.{backend_name}.q{num_qubits}"] = metric(
+                min(samples) * 1e3, "ms", "time"
+            )
+    return metrics
+
+
+def bench_result_memory(seed, quick, repeats):
+    """Traced bytes per result retained in a ResultsStore, by result kind."""
+    processor = make_processor(seed)
+    rng = np.random.default_rng(seed)
+    samples = {
+        "simulation": qp.QuantumTask("s", qp.QuantumComputationType.SIMULATION, {},
+                                     {"num_qubits": 4, "evolution_time": 0.3}),
+        "qaoa": qp.QuantumTask("o", qp.QuantumComputationType.OPTIMIZATION, {},
+                               {"num_qubits": 4, "optimize": False}, max_qubits=10),
+        "hybrid": hybrid_task("h", rng)
+    }
+    count = 2000 if quick else 20000
+    metrics = {}
+    for kind, task in samples.items():
+        result = asyncio.run(processor.process_task(task))
+        blob = pickle.dumps(result)
+        gc.collect()
+        tracemalloc.start()
+        store = qp.ResultsStore(max_entries=count, max_bytes=1 << 40, ttl=None)
+        for i in range(count):
+            store.put(f"{kind}-{i}", pickle.loads(blob))
+        gc.collect()
+        traced, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        metrics[f"result_memory.{kind}"] = metric(traced / count, "bytes", "memory")
+        del store
+    return metrics
+
+
+def bench_hybrid_latency(seed, quick, repeats):
+    """End-to-end process_task latency of hybrid tasks."""
+    processor = make_processor(seed)
+    rng = np.random.default_rng(seed)
+    count = 100 if quick else 500
+
+    async def run(repeat):
+        latencies = []
+        for i in range(count):
+            task = hybrid_task(f"latency-{repeat}-{i}", rng)
+            started = time.perf_counter()
+            result = await processor.process_task(task)
+            latencies.append(time.perf_counter() - started)
+            if not result.success:
+                raise RuntimeError(f"Benchmark task {task.task_id} failed: {result.error_message}")
+        return np.array(latencies) * 1e3
+
+    async def run_all():
+        try:
+            return [await run(repeat) for repeat in range(repeats)]
+        finally:
+            await processor.stop()
+
+    samples = asyncio.run(run_all())
+    return {
+        "hybrid_latency.p50": metric(min(np.percentile(s, 50) for s in samples), "ms", "time"),
+        "hybrid_latency.p99": metric(min(np.percentile(s, 99) for s in samples), "ms", "time", tolerance=0.5)
+    }
+
+
+BENCHMARKS = {
+    "strategy_selection": bench_strategy_selection,
+    "queue_throughput": bench_queue_throughput,
+    "simulation_scaling": bench_simulation_scaling,
+    "result_memory": bench_result_memory,
+    "hybrid_latency": bench_hybrid_latency
+}
+
+
+def calibrate(repeats):
+    """Best time in ms of a fixed mix of interpreter and NumPy work, as a measure of current CPU speed."""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        matrix = np.random.default_rng(0).standard_normal((96, 96))
+        for _ in range(20):
+            matrix = np.tanh(matrix @ matrix * 0.01)
+        total = 0
+        for i in range(100000):
+            total += i * i % 7
+        samples.append(time.perf_counter() - started)
+    return min(samples) * 1e3
+
+
+def run_suite(names, seed=0, quick=False, repeats=5):
+    """Run the named benchmarks and return a report."""
+    metrics = {}
+    durations = {}
+    for name in names:
+        started = time.perf_counter()
+        before = calibrate(repeats)
+        results = BENCHMARKS[name](seed, quick, repeats)
+        calibration = (before + calibrate(repeats)) / 2
+        for entry in results.values():
+            entry["benchmark"] = name
+            if entry["kind"] != "memory":
+                entry["calibration_ms"] = calibration
+        metrics.update(results)
+        durations[name] = round(time.perf_counter() - started, 3)
+    return {
+        "suite_version": SUITE_VERSION,
+        "created_at": time.time(),
+        "settings": {"seed": seed, "quick": quick, "repeats": repeats, "benchmarks": list(names)},
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "durations_seconds": durations,
+        "metrics": metrics
+    }
+
+
+def _relative_change(value, reference):
+    return (value - reference) / reference if reference else 0.0
+
+
+def compare_to_baseline(report, baseline, tolerance=None):
+    """
+    Compare a report's metrics with a baseline report.
+
+    A metric regresses when it moved in its bad direction (up for time
+    and memory, down for throughput) by more than its tolerance: the
+    ``tolerance`` argument if given, else the baseline entry's own
+    ``tolerance``, else the default for its kind. Timings and throughputs
+    must also be worse after scaling by the ratio of the two runs'
+    calibration times, so neither a slow machine nor a noisy calibration
+    fails the gate on its own. Metrics missing from either side are
+    listed but never fail the gate.
+    """
+    rows = []
+    for name, expected in sorted(baseline["metrics"].items()):
+        actual = report["metrics"].get(name)
+        if actual is None:
+            rows.append({"metric": name, "status": "missing"})
+            continue
+        allowed = tolerance if tolerance is not None else expected.get(
+            "tolerance", DEFAULT_TOLERANCES[expected["kind"]]
+        )
+        slowdown = 1.0
+        if expected.get("calibration_ms") and actual.get("calibration_ms"):
+            slowdown = actual["calibration_ms"] / expected["calibration_ms"]
+        reference = expected["value"] / slowdown if expected["kind"] == "throughput" else expected["value"] * slowdown
+        change = _relative_change(actual["value"], expected["value"])
+        normalized_change = _relative_change(actual["value"], reference)
+        sign = -1 if expected["kind"] == "throughput" else 1
+        worse = min(sign * change, sign * normalized_change)
+        rows.append({
+            "metric": name,
+            "baseline": expected["value"],
+            "value": actual["value"],
+            "unit": actual["unit"],
+            "machine_slowdown": round(slowdown, 4),
+            "change": round(change, 4),
+            "normalized_change": round(normalized_change, 4),
+            "tolerance": allowed,
+            "status": "regression" if worse > allowed else "ok"
+        })
+    for name in sorted(set(report["metrics"]) - set(baseline["metrics"])):
+        rows.append({"metric": name, "status": "new"})
+    return {
+        "regressions": [row["metric"] for row in rows if row["status"] == "regression"],
+        "rows": rows
+    }
+
+
+def confirm_regressions(report, baseline, args):
+    """Re-run benchmarks with regressed metrics, keeping each metric's better comparison."""
+    regressed = report["comparison"]["regressions"]
+    names = sorted({report["metrics"][name]["benchmark"] for name in regressed})
+    print(f"Re-running {', '.join(names)} to confirm {len(regressed)} regression(s)")
+    rerun = run_suite(names, seed=args.seed, quick=args.quick, repeats=args.repeats)
+    rows = {row["metric"]: row for row in report["comparison"]["rows"]}
+    rerun_rows = {row["metric"]: row for row in compare_to_baseline(rerun, baseline, args.tolerance)["rows"]}
+
+    for name in regressed:
+        retried = rerun_rows.get(name, {})
+        sign = -1 if report["metrics"][name]["kind"] == "throughput" else 1
+        if "change" in retried and sign * retried["normalized_change"] < sign * rows[name]["normalized_change"]:
+            report["metrics"][name] = rerun["metrics"][name]
+    report["comparison"] = compare_to_baseline(report, baseline, args.tolerance)
+    report["comparison"]["rerun"] = names
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="benchmarks to run (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=5, help="timed repetitions; the best is reported")
+    parser.add_argument("--quick", action="store_true", help="smaller workloads for a fast smoke run")
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, help="override every metric's allowed relative regression")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--no-confirm", action="store_true", help="fail on the first run instead of re-running regressions")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.only or list(BENCHMARKS), seed=args.seed, quick=args.quick, repeats=args.repeats)
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {args.baseline}")
+    elif args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        if baseline["settings"]["quick"] != args.quick or baseline["settings"]["seed"] != args.seed:
+            print("Baseline was recorded with different --quick/--seed settings; comparison skipped")
+        else:
+            report["comparison"] = compare_to_baseline(report, baseline, args.tolerance)
+            if report["comparison"]["regressions"] and not args.no_confirm:
+                report = confirm_regressions(report, baseline, args)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+    comparison = report.get("comparison")
+    for name, entry in report["metrics"].items():
+        print(f"{name:45s} {entry['value']:14.3f} {entry['unit']}")
+    if comparison is None:
+        return 0
+    for row in comparison["rows"]:
+        if row["status"] == "regression":
+            print(f"REGRESSION {row['metric']}: {row['baseline']:.3f} -> {row['value']:.3f} {row['unit']} "
+                  f"({row['change']:+.1%}, {row['normalized_change']:+.1%} calibrated, "
+                  f"tolerance {row['tolerance']:.0%})")
+    if comparison["regressions"]:
+        return 1
+    print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Unit tests for the benchmark suite's workloads and regression gate.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+BENCH_PATH = Path(__file__).resolve().parents[1] / "benchmarks" / "bench_quantum_processor.py"
+
+
+def load_benchmarks():
+    """Load the benchmark script as a module."""
+    if "bench_quantum_processor" not in sys.modules:
+        spec = importlib.util.spec_from_file_location("bench_quantum_processor", BENCH_PATH)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["bench_quantum_processor"] = module
+        spec.loader.exec_module(module)
+    return sys.modules["bench_quantum_processor"]
+
+
+bench = load_benchmarks()
+
+
+def report(**values):
+    kinds = {"latency": ("ms", "time"), "throughput": ("tasks/s", "throughput"), "memory": ("bytes", "memory")}
+    return {"metrics": {name: bench.metric(value, *kinds[name]) for name, value in values.items()}}
+
+
+class TestRegressionGate:
+    """Baseline comparison of benchmark reports."""
+
+    def test_regressions_respect_direction_and_tolerance(self):
+        """Test slower timings and lower throughput fail, improvements and small drifts pass."""
+        # Arrange
+        baseline = report(latency=10.0, throughput=100.0, memory=1000.0)
+        current = report(latency=14.0, throughput=150.0, memory=1050.0)
+
+        # Act
+        comparison = bench.compare_to_baseline(current, baseline)
+        relaxed = bench.compare_to_baseline(current, baseline, tolerance=0.5)
+
+        # Assert
+        assert comparison["regressions"] == ["latency"]
+        assert relaxed["regressions"] == []
+
+    def test_timings_are_compared_relative_to_calibration(self):
+        """Test a uniformly slower machine does not count as a regression."""
+        # Arrange
+        baseline = report(latency=10.0, throughput=100.0)
+        current = report(latency=14.0, throughput=72.0)
+        for entry in baseline["metrics"].values():
+            entry["calibration_ms"] = 10.0
+        for entry in current["metrics"].values():
+            entry["calibration_ms"] = 14.0
+
+        # Act
+        comparison = bench.compare_to_baseline(current, baseline)
+
+        # Assert
+        assert comparison["regressions"] == []
+        assert all(row["machine_slowdown"] == 1.4 for row in comparison["rows"])
+
+    def test_missing_and_new_metrics_do_not_fail(self):
+        """Test metrics present on only one side are reported without failing the gate."""
+        # Arrange
+        baseline = report(latency=10.0)
+        current = report(memory=1000.0)
+
+        # Act
+        comparison = bench.compare_to_baseline(current, baseline)
+
+        # Assert
+        assert comparison["regressions"] == []
+        assert {row["metric"]: row["status"] for row in comparison["rows"]} == {"latency": "missing", "memory": "new"}
+
+
+class TestWorkloads:
+    """Seeded benchmark workloads."""
+
+    def test_workload_is_reproducible_from_its_seed(self):
+        """Test the same seed yields the same tasks and a different seed does not."""
+        # Arrange
+        def contents(tasks):
+            return [(task.task_id, task.classical_data, task.quantum_parameters) for task in tasks]
+
+        # Act
+        first = contents(bench.make_workload(7, 20))
+        second = contents(bench.make_workload(7, 20))
+        other = contents(bench.make_workload(8, 20))
+
+        # Assert
+        assert first == second
+        assert first != other
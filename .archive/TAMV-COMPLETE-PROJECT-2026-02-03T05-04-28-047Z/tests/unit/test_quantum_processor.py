@@ -0,0 +1,1894 @@
+"""
+Unit tests for the quantum-classical hybrid processing engine.
+Runs on a CPU-only machine without Qiskit or the classical ML frameworks.
+"""
+
+import asyncio
+import importlib.util
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+MODULE_PATH = Path(__file__).resolve().parents[2] / "src" / "quantum-engine" / "quantum-processor.py"
+
+# Import budget for the engine module when no ML framework is loaded
+IMPORT_BUDGET_SECONDS = 3.0
+
+
+def load_quantum_processor():
+    """Load quantum-processor.py, whose file name is not importable directly."""
+    if "quantum_processor" not in sys.modules:
+        spec = importlib.util.spec_from_file_location("quantum_processor", MODULE_PATH)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["quantum_processor"] = module
+        spec.loader.exec_module(module)
+    return sys.modules["quantum_processor"]
+
+
+def load_task_distribution():
+    """Load task-distribution.py, which shares the engine module loaded above."""
+    if "task_distribution" not in sys.modules:
+        spec = importlib.util.spec_from_file_location("task_distribution", MODULE_PATH.with_name("task-distribution.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["task_distribution"] = module
+        spec.loader.exec_module(module)
+    return sys.modules["task_distribution"]
+
+
+qp = load_quantum_processor()
+td = load_task_distribution()
+
+
+class TestLazyFrameworkLoading:
+    """ML frameworks must not be imported until a task needs them."""
+
+    def test_module_import_stays_under_budget(self):
+        """Test importing the module is fast and pulls in no ML framework."""
+        # Arrange
+        script = (
+            "import importlib.util, json, sys, time\n"
+            "start = time.perf_counter()\n"
+            f"spec = importlib.util.spec_from_file_location('quantum_processor', {str(MODULE_PATH)!r})\n"
+            "module = importlib.util.module_from_spec(spec)\n"
+            "spec.loader.exec_module(module)\n"
+            "elapsed = time.perf_counter() - start\n"
+            "loaded = [m for m in ('tensorflow', 'torch', 'transformers') if m in sys.modules]\n"
+            "print(json.dumps({'elapsed': elapsed, 'loaded': loaded}))\n"
+        )
+
+        # Act
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        report = json.loads(output.stdout.strip().splitlines()[-1])
+
+        # Assert
+        assert report["loaded"] == []
+        assert report["elapsed"] < IMPORT_BUDGET_SECONDS
+
+    def test_processor_init_does_not_load_frameworks(self):
+        """Test the processor starts with only the Isabella classical processor."""
+        # Act
+        processor = qp.create_quantum_processor({})
+        report = processor.get_startup_report()
+
+        # Assert
+        assert set(processor.classical_processors) == {"isabella"}
+        assert report["frameworks_loaded"] == {}
+        assert report["module_load_seconds"] >= 0.0
+
+    def test_unknown_framework_is_rejected(self):
+        """Test an unknown framework name fails instead of importing arbitrary modules."""
+        with pytest.raises(ValueError):
+            qp.load_ml_framework("os")
+
+
+class TestShotSampler:
+    """Vectorized shot sampling with adaptive early stopping."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        import numpy as np
+
+        self.np = np
+        self.sampler = qp.ShotSampler(np.random.default_rng(7))
+
+    def test_fixed_shots_draw_full_budget(self):
+        """Test non-adaptive sampling executes exactly the requested shots."""
+        # Arrange
+        statevectors = self.np.full((2, 8), 1 / self.np.sqrt(8), dtype=complex)
+
+        # Act
+        counts = self.sampler.sample(statevectors, [1000, 37], 3)
+
+        # Assert
+        assert [c.total for c in counts] == [1000, 37]
+
+    def test_adaptive_sampling_stops_once_winner_is_clear(self):
+        """Test adaptive sampling stops early for a dominant state but not for a tie."""
+        # Arrange
+        statevectors = self.np.zeros((2, 4), dtype=complex)
+        statevectors[0, 2] = self.np.sqrt(0.9)
+        statevectors[0, 1] = self.np.sqrt(0.1)
+        statevectors[1, :2] = self.np.sqrt(0.5)
+
+        # Act
+        dominant, tied = self.sampler.sample(statevectors, 100000, 2, adaptive=True)
+
+        # Assert
+        assert dominant.most_frequent() == "10"
+        assert dominant.total < 1000
+        assert tied.total == 100000
+
+
+class TestQAOAOptimizer:
+    """Variational QAOA angle optimization."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        import numpy as np
+
+        self.np = np
+        self.problem = qp.QAOAProblem.from_parameters({
+            "num_qubits": 4,
+            "num_layers": 2,
+            "cost_function": {"edges": [[0, 1, 1.0], [1, 2, 0.5], [2, 3], [0, 3, 2.0]]},
+        })
+
+    def test_parameter_shift_gradient_matches_finite_differences(self):
+        """Test the parameter-shift gradient agrees with central differences."""
+        # Arrange
+        optimizer = qp.QAOAOptimizer(self.problem, "ADAM")
+        params = self.np.array([0.3, 0.7, 0.4, 0.2])
+        eps = 1e-6
+
+        # Act
+        _, gradient = optimizer.value_and_gradient(params)
+        numeric = [
+            (optimizer.energy(params + eps * unit) - optimizer.energy(params - eps * unit)) / (2 * eps)
+            for unit in self.np.eye(len(params))
+        ]
+
+        # Assert
+        assert self.np.allclose(gradient, numeric, atol=1e-5)
+
+    @pytest.mark.parametrize("method", ["COBYLA", "SPSA", "ADAM"])
+    def test_optimizer_lowers_energy(self, method):
+        """Test every optimizer improves on the fixed starting angles."""
+        # Arrange
+        optimizer = qp.QAOAOptimizer(self.problem, method, max_iterations=60, rng=self.np.random.default_rng(0))
+        start = self.problem.ramp_parameters()
+
+        # Act
+        result = optimizer.minimize(start)
+
+        # Assert
+        assert result.energy < optimizer.energy(start)
+
+
+class TestMetrics:
+    """Streaming metrics and Prometheus export."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        import numpy as np
+
+        self.np = np
+        self.processor = qp.create_quantum_processor({"seed": 1})
+
+    def test_sketch_quantiles_stay_within_relative_accuracy(self):
+        """Test sketch quantiles are within the configured relative error."""
+        # Arrange
+        values = self.np.random.default_rng(0).lognormal(0.0, 2.0, 20000)
+        sketch = qp.QuantileSketch(relative_accuracy=0.01)
+
+        # Act
+        for value in values:
+            sketch.add(float(value))
+
+        # Assert
+        for q in (0.5, 0.9, 0.99):
+            exact = self.np.quantile(values, q)
+            assert abs(sketch.quantile(q) / exact - 1) < 0.02
+
+    def test_failures_count_towards_success_rate(self):
+        """Test failed tasks are recorded and lower the success rate."""
+        # Arrange
+        async def fail(task):
+            raise RuntimeError("backend lost")
+
+        async def run():
+            await self.processor.process_task(self._task("ok"))
+            self.processor._process_quantum_only = fail
+            await self.processor.process_task(self._task("broken"))
+            return await self.processor.get_metrics()
+
+        # Act
+        metrics = asyncio.run(run())
+
+        # Assert
+        assert metrics["tasks_processed"] == 2
+        assert metrics["failed_tasks"] == 1
+        assert metrics["success_rate"] == 0.5
+        assert metrics["by_strategy"] == {"quantum_only": 2}
+
+    def test_prometheus_export(self):
+        """Test metrics render in the Prometheus text format."""
+        # Arrange
+        asyncio.run(self.processor.process_task(self._task("ok")))
+
+        # Act
+        text = asyncio.run(self.processor.get_metrics(format="prometheus"))
+
+        # Assert
+        assert "# TYPE tamv_quantum_tasks_total counter" in text
+        assert 'tamv_quantum_tasks_total{status="success",strategy="quantum_only",task_type="optimization"} 1' in text
+        assert 'tamv_quantum_task_execution_seconds_count{strategy="quantum_only",task_type="optimization"} 1' in text
+
+    def _task(self, task_id):
+        return qp.QuantumTask(
+            task_id, qp.QuantumComputationType.OPTIMIZATION, {}, {"num_qubits": 4, "optimize": False}, max_qubits=10
+        )
+
+
+class TestHealthCheck:
+    """Cached health reporting backed by a background prober."""
+
+    def test_health_check_returns_cached_state(self):
+        """Test the first check reports 'starting' and later checks use the probe result."""
+        # Arrange
+        processor = qp.create_quantum_processor({"health_check_interval": 60.0})
+
+        async def run():
+            first = await processor.health_check()
+            await processor.readiness(refresh=True)
+            second = await processor.health_check()
+            return first, second
+
+        # Act
+        first, second = asyncio.run(run())
+
+        # Assert
+        assert first["system_status"] == "starting"
+        assert first["liveness"]["alive"] is True
+        assert second["system_status"] == "healthy"
+        assert second["readiness"]["checks"] == {"numpy_statevector": "passed"}
+        assert {"queue_depth", "workers", "cache_memory_bytes"} <= set(second)
+
+
+class TestTaskJournal:
+    """Write-ahead journal replay after a restart."""
+
+    def test_recover_returns_unfinished_tasks_and_results(self, tmp_path):
+        """Test replay requeues unfinished tasks and reloads completed results."""
+        # Arrange
+        path = str(tmp_path / "journal.db")
+        journal = qp.TaskJournal(path)
+        tasks = [
+            qp.QuantumTask(f"t{i}", qp.QuantumComputationType.SIMULATION, {"i": i}, {"num_qubits": 2})
+            for i in range(3)
+        ]
+        for task in tasks:
+            journal.record_submit(task)
+        journal.record_start("t0")
+        journal.record_start("t1")
+        journal.record_completion(qp.QuantumResult("t1", True, {"value": 1}, None, None, 0.1, 2, 10))
+        journal.close()
+
+        # Act
+        reopened = qp.TaskJournal(path)
+        unfinished, results = reopened.recover()
+        reopened.close()
+
+        # Assert
+        assert [task.task_id for task in unfinished] == ["t0", "t2"]
+        assert unfinished[1].classical_data == {"i": 2}
+        assert [result.task_id for result in results] == ["t1"]
+        assert results[0].quantum_result == {"value": 1}
+
+
+    def test_completions_are_encoded_by_the_writer(self, tmp_path):
+        """Test unencodable payloads and large arrays do not fail the record or the task."""
+        # Arrange
+        path = str(tmp_path / "journal.db")
+        journal = qp.TaskJournal(path, max_array_bytes=1024)
+        large = qp.np.zeros(1024, dtype=qp.np.complex128)
+        journal.record_completion(
+            qp.QuantumResult("large", True, {"statevector": large, "energy": -1.0}, None, None, 0.1, 4, 0)
+        )
+        journal.record_completion(qp.QuantumResult("set", True, {"labels": {"a", "b"}}, None, None, 0.1, 1, 0))
+        journal.flush(5)
+        stats = journal.get_stats()
+        journal.close()
+
+        # Act
+        reopened = qp.TaskJournal(path)
+        _, results = reopened.recover()
+        reopened.close()
+
+        # Assert
+        assert stats["dropped_arrays"] == 1
+        assert stats["unencodable"] == 1
+        assert [result.task_id for result in results] == ["large", "set"]
+        assert results[0].quantum_result == {"statevector": None, "energy": -1.0}
+        assert results[1].success and results[1].quantum_result is None
+
+    def test_finalize_keeps_success_for_unencodable_payload(self, tmp_path):
+        """Test a successful result stays successful when the journal cannot encode it."""
+        # Arrange
+        processor = qp.create_quantum_processor({"journal_path": str(tmp_path / "journal.db")})
+        task = qp.QuantumTask("t", qp.QuantumComputationType.SIMULATION, {}, {"num_qubits": 2})
+
+        async def run():
+            return await processor._finalize_result(task, {"quantum": {"labels": {"a"}}, "confidence": 0.0}, 0.1)
+
+        # Act
+        result = asyncio.run(run())
+        processor.journal.flush(5)
+
+        # Assert
+        assert result.success
+        assert processor.results_store.get("t").success
+        assert processor.journal.get_stats()["unencodable"] == 1
+
+    def test_writer_compacts_periodically(self, tmp_path):
+        """Test the writer thread drops expired completions while the journal stays open."""
+        # Arrange
+        journal = qp.TaskJournal(str(tmp_path / "journal.db"), retention=0.0, compact_interval=0.0)
+        journal.record_completion(qp.QuantumResult("old", True, {"value": 1}, None, None, 0.1, 1, 0))
+        journal.flush(5)
+
+        # Act
+        journal.record_start("next")
+        journal.flush(5)
+        journal.record_start("later")
+        journal.flush(5)
+        _, results = journal.recover()
+        journal.close()
+
+        # Assert
+        assert results == []
+        assert journal.get_stats()["compactions"] >= 2
+
+class TestMemoization:
+    """Content-addressed reuse of identical tasks."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.processor = qp.create_quantum_processor({"seed": 1})
+
+    def test_content_key_ignores_task_id_and_dict_order(self):
+        """Test identical content hashes the same regardless of id and key order."""
+        # Arrange
+        first = qp.QuantumTask("a", qp.QuantumComputationType.SIMULATION, {}, {"num_qubits": 3, "evolution_time": 2.0})
+        second = qp.QuantumTask("b", qp.QuantumComputationType.SIMULATION, {}, {"evolution_time": 2.0, "num_qubits": 3})
+
+        # Act / Assert
+        assert qp.task_content_key(first) == qp.task_content_key(second)
+        assert qp.task_content_key(first) != qp.task_content_key(first, seed=1)
+
+    def test_identical_tasks_reuse_and_join(self):
+        """Test simulations reuse stored results and concurrent optimizations join one run."""
+        # Arrange
+        def simulation(task_id):
+            return qp.QuantumTask(task_id, qp.QuantumComputationType.SIMULATION, {}, {"num_qubits": 4}, max_qubits=10)
+
+        def optimization(task_id):
+            return qp.QuantumTask(
+                task_id, qp.QuantumComputationType.OPTIMIZATION, {}, {"num_qubits": 4}, max_qubits=10
+            )
+
+        async def run():
+            await self.processor.process_task(simulation("s1"))
+            repeated = await self.processor.process_task(simulation("s2"))
+            joined = await asyncio.gather(*(self.processor.process_task(optimization(f"o{i}")) for i in range(3)))
+            return repeated, joined, await self.processor.get_metrics()
+
+        # Act
+        repeated, joined, metrics = asyncio.run(run())
+
+        # Assert
+        assert repeated.task_id == "s2" and repeated.success
+        assert [result.task_id for result in joined] == ["o0", "o1", "o2"]
+        assert metrics["memo"]["hits"] == 1
+        assert metrics["memo"]["joined"] == 2
+        assert metrics["memo"]["hit_rate"] == 0.6
+
+
+class TestSubmissionValidation:
+    """Concurrent, cached and micro-batched submission checks."""
+
+    def test_checks_run_concurrently_batched_and_cached(self):
+        """Test submissions batch validator calls and reuse cached verdicts."""
+        # Arrange
+        class SlowSecurity:
+            def __init__(self):
+                self.calls = 0
+
+            async def validate_quantum_task(self, task):
+                return (await self.validate_quantum_tasks([task]))[0]
+
+            async def validate_quantum_tasks(self, tasks):
+                self.calls += 1
+                await asyncio.sleep(0.05)
+                return [qp.ValidationVerdict(True) for _ in tasks]
+
+        class SlowEthics:
+            async def assess_quantum_computation(self, task):
+                await asyncio.sleep(0.05)
+                return qp.ValidationVerdict(task.classical_data.get("purpose") != "blocked", "blocked purpose")
+
+        security = SlowSecurity()
+        processor = qp.create_quantum_processor({"security_validator": security, "ethics_validator": SlowEthics()})
+
+        def task(i, purpose="research"):
+            return qp.QuantumTask(f"t{i}", qp.QuantumComputationType.SIMULATION, {"purpose": purpose, "i": i}, {})
+
+        async def run():
+            started = time.perf_counter()
+            await asyncio.gather(*(processor.submit_task(task(i)) for i in range(10)))
+            elapsed = time.perf_counter() - started
+            await processor.submit_task(task(0))
+            with pytest.raises(qp.EthicalError):
+                await processor.submit_task(task(99, purpose="blocked"))
+            return elapsed
+
+        # Act
+        elapsed = asyncio.run(run())
+        stats = processor.security_gate.get_stats()
+
+        # Assert
+        assert elapsed < 0.09
+        assert security.calls == 2
+        assert stats["cache_hits"] == 1
+
+    def test_cached_approval_does_not_cover_other_timeouts(self):
+        """Test a task over the timeout limit is rejected even after an otherwise identical task was approved."""
+        # Arrange
+        processor = qp.create_quantum_processor({})
+
+        def task(task_id, timeout):
+            return qp.QuantumTask(task_id, qp.QuantumComputationType.SIMULATION, {}, {"num_qubits": 3}, timeout=timeout)
+
+        async def run():
+            await processor.submit_task(task("allowed", 10.0))
+            with pytest.raises(qp.SecurityError):
+                await processor.submit_task(task("too-long", 1e9))
+
+        # Act / Assert
+        asyncio.run(run())
+        assert qp.task_validation_key(task("a", 10.0)) != qp.task_validation_key(task("a", 1e9))
+        assert qp.task_content_key(task("a", 10.0)) == qp.task_content_key(task("a", 1e9))
+
+    def test_short_verdict_list_fails_every_waiter(self):
+        """Test a batch check returning too few verdicts fails each pending check instead of hanging."""
+        # Arrange
+        class ShortSecurity:
+            async def validate_quantum_task(self, task):
+                return qp.ValidationVerdict(True)
+
+            async def validate_quantum_tasks(self, tasks):
+                return [qp.ValidationVerdict(True)]
+
+        gate = qp.ValidationGate("security", ShortSecurity(), "validate_quantum_task", batch_window=0.01)
+        tasks = [qp.QuantumTask(f"t{i}", qp.QuantumComputationType.SIMULATION, {"i": i}, {}) for i in range(3)]
+
+        async def run():
+            return await asyncio.wait_for(
+                asyncio.gather(*(gate.verdict(task) for task in tasks), return_exceptions=True), timeout=1.0
+            )
+
+        # Act
+        outcomes = asyncio.run(run())
+
+        # Assert
+        assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+        assert gate.get_stats()["cached_verdicts"] == 0
+        assert not gate._waiting
+
+
+class TestBatchProcessing:
+    """Stacked simulation of structurally compatible tasks in process_batch."""
+
+    EDGES = [[0, 1], [1, 2], [2, 3], [3, 0]]
+
+    @classmethod
+    def qaoa(cls, task_id, gamma=0.4, beta=0.3, edges=None):
+        return qp.QuantumTask(
+            task_id, qp.QuantumComputationType.OPTIMIZATION, {},
+            {"num_qubits": 4, "num_layers": 1, "cost_function": {"edges": edges or cls.EDGES}, "optimize": False,
+             "gammas": [gamma], "betas": [beta]},
+            shots=256
+        )
+
+    @staticmethod
+    def simulation(task_id, num_qubits=4, evolution_time=0.3):
+        return qp.QuantumTask(
+            task_id, qp.QuantumComputationType.SIMULATION, {}, {"num_qubits": num_qubits, "evolution_time": evolution_time}
+        )
+
+    @staticmethod
+    def record_groups(processor, monkeypatch):
+        groups = []
+        original = processor._process_batch_group
+
+        async def recording(key, tasks):
+            groups.append((key, [task.task_id for task in tasks]))
+            return await original(key, tasks)
+
+        monkeypatch.setattr(processor, "_process_batch_group", recording)
+        return groups
+
+    def test_tasks_are_grouped_by_circuit_structure(self, monkeypatch):
+        """Test tasks sharing (kind, qubits, depth, edges) form one group, lone QAOA tasks included."""
+        # Arrange
+        processor = qp.create_quantum_processor({})
+        groups = self.record_groups(processor, monkeypatch)
+        tasks = [
+            self.qaoa("q1"), self.simulation("s1"), self.qaoa("q2", gamma=0.9),
+            self.qaoa("other-edges", edges=[[0, 1], [1, 2]]), self.simulation("s2"),
+            self.simulation("s-wide", num_qubits=5),
+        ]
+
+        # Act
+        results = asyncio.run(processor.process_batch(tasks))
+
+        # Assert
+        assert [ids for _, ids in groups] == [["q1", "q2"], ["s1", "s2"], ["other-edges"]]
+        assert groups[0][0][:3] == ("qaoa", 4, 1) and groups[1][0][:3] == ("evolution", 4, 3)
+        assert [result.task_id for result in results] == [task.task_id for task in tasks]
+        assert all(result.success for result in results)
+
+    def test_qaoa_samples_fixed_angles_in_batches_by_default(self, monkeypatch):
+        """Test QAOA tasks without an 'optimize' flag are batched, and opting in runs them alone."""
+        # Arrange
+        def qaoa(task_id, **extra):
+            return qp.QuantumTask(
+                task_id, qp.QuantumComputationType.OPTIMIZATION, {},
+                {"num_qubits": 4, "num_layers": 1, "cost_function": {"edges": self.EDGES}, **extra}, shots=64
+            )
+
+        processor = qp.create_quantum_processor({})
+        groups = self.record_groups(processor, monkeypatch)
+        tasks = [qaoa("a"), qaoa("b"), qaoa("c"), qaoa("optimized", optimize=True, max_iterations=5)]
+
+        # Act
+        results = asyncio.run(processor.process_batch(tasks))
+
+        # Assert
+        assert [ids for _, ids in groups] == [["a", "b", "c"]]
+        assert all(result.success for result in results)
+        assert "optimizer" in results[3].quantum_result and "optimizer" not in results[0].quantum_result
+        assert not processor._qaoa_should_optimize(tasks[0], batched=True)
+        assert processor._qaoa_should_optimize(tasks[0])
+
+    def test_groups_are_chunked_by_max_amplitudes(self, monkeypatch):
+        """Test a group is split so no stacked tensor exceeds batch_max_amplitudes."""
+        # Arrange
+        processor = qp.create_quantum_processor({"batch_max_amplitudes": 2 * 16})
+        groups = self.record_groups(processor, monkeypatch)
+        tasks = [self.qaoa(f"q{i}", gamma=0.1 * i) for i in range(5)]
+
+        # Act
+        results = asyncio.run(processor.process_batch(tasks))
+
+        # Assert
+        assert [ids for _, ids in groups] == [["q0", "q1"], ["q2", "q3"], ["q4"]]
+        assert [result.task_id for result in results] == ["q0", "q1", "q2", "q3", "q4"]
+
+    def test_batched_angles_match_individual_processing(self, monkeypatch):
+        """Test each row of a batch is simulated with its own task's angles, as process_task would."""
+        # Arrange
+        processor = qp.create_quantum_processor({})
+        sampled = []
+        original = processor.shot_sampler.sample
+
+        def recording(statevectors, *args, **kwargs):
+            sampled.extend(qp.np.array(statevectors))
+            return original(statevectors, *args, **kwargs)
+
+        monkeypatch.setattr(processor.shot_sampler, "sample", recording)
+        tasks = [self.qaoa(f"q{i}", gamma=0.2 + 0.3 * i, beta=0.7 - 0.2 * i) for i in range(3)]
+        singles = [self.qaoa(f"single-{i}", gamma=0.2 + 0.3 * i, beta=0.7 - 0.2 * i) for i in range(3)]
+
+        # Act
+        batched = asyncio.run(processor.process_batch(tasks))
+        individual = [asyncio.run(processor.process_task(task)) for task in singles]
+
+        # Assert
+        assert len(sampled) == 6
+        for row, single_row in zip(sampled[:3], sampled[3:]):
+            assert qp.np.allclose(row, single_row)
+        for batch_result, single_result in zip(batched, individual):
+            assert batch_result.quantum_result["optimal_parameters"] == single_result.quantum_result["optimal_parameters"]
+
+    def test_admission_error_fails_every_task_in_group(self):
+        """Test a group too large for the memory budget fails each of its tasks."""
+        # Arrange
+        processor = qp.create_quantum_processor({"memory_budget_bytes": 1024})
+        tasks = [self.qaoa("q1"), self.qaoa("q2", gamma=0.9)]
+
+        # Act
+        results = asyncio.run(processor.process_batch(tasks))
+
+        # Assert
+        assert [result.success for result in results] == [False, False]
+        assert all("budget" in result.error_message for result in results)
+        assert processor.admission.reserved_bytes == 0
+        assert not processor.active_tasks
+
+    def test_simulation_error_fails_every_task_in_group(self, monkeypatch):
+        """Test an exception inside the stacked simulation is reported for each task of the group."""
+        # Arrange
+        processor = qp.create_quantum_processor({})
+        simulator = processor.quantum_backends["numpy_statevector"]
+
+        def broken(*args, **kwargs):
+            raise RuntimeError("simulator fault")
+
+        monkeypatch.setattr(simulator, "run", broken)
+        tasks = [self.qaoa("q1"), self.qaoa("q2", gamma=0.9), self.qaoa("q3", gamma=1.1)]
+
+        # Act
+        results = asyncio.run(processor.process_batch(tasks))
+
+        # Assert
+        assert [result.task_id for result in results] == ["q1", "q2", "q3"]
+        assert all(not result.success and result.error_message == "simulator fault" for result in results)
+        assert processor.admission.reserved_bytes == 0
+
+
+    def test_expired_tasks_fail_before_grouping_and_groups_share_one_slot(self, monkeypatch):
+        """Test tasks past their deadline are failed up front and each group claims one slot."""
+        # Arrange
+        processor = qp.create_quantum_processor({})
+        groups = self.record_groups(processor, monkeypatch)
+        expired = self.qaoa("expired")
+        expired.created_at -= expired.timeout + 1
+        tasks = [self.qaoa("q1"), expired, self.qaoa("q2", gamma=0.9)]
+
+        # Act
+        results = asyncio.run(processor.process_batch(tasks))
+        stats = processor.scheduler.get_stats()
+
+        # Assert
+        assert [result.task_id for result in results] == ["q1", "expired", "q2"]
+        assert [result.success for result in results] == [True, False, True]
+        assert "passed its deadline before starting" in results[1].error_message
+        assert [ids for _, ids in groups] == [["q1", "q2"]]
+        assert stats["dispatched"] == 1
+        assert stats["deadline_misses"] == 1
+
+    def test_group_is_bounded_by_its_earliest_deadline(self, monkeypatch):
+        """Test a group still running at its earliest task deadline fails every task in it."""
+        # Arrange
+        processor = qp.create_quantum_processor({})
+
+        async def slow(key, tasks):
+            await asyncio.sleep(5)
+
+        monkeypatch.setattr(processor, "_process_batch_group", slow)
+        urgent = self.qaoa("urgent")
+        urgent.timeout = 0.2
+        tasks = [self.qaoa("relaxed"), urgent]
+
+        # Act
+        start = time.perf_counter()
+        results = asyncio.run(processor.process_batch(tasks))
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        assert elapsed < 2
+        assert not any(result.success for result in results)
+        assert all("missed the earliest deadline" in result.error_message for result in results)
+        assert processor.scheduler.get_stats()["deadline_misses"] == 2
+
+class TestHybridOverlap:
+    """Classical prefix of hybrid tasks running alongside the quantum component."""
+
+    @staticmethod
+    def hybrid_task(task_id="h"):
+        return qp.QuantumTask(
+            task_id, qp.QuantumComputationType.MACHINE_LEARNING,
+            {"records": [0.5, 1.5, -0.25, 2.0], "processing_steps": 60},
+            {"num_qubits": 4, "problem_size": 20}, max_qubits=10
+        )
+
+    class RendezvousEthicalCore:
+        """Ethical core that only answers once the quantum component has started."""
+
+        def __init__(self):
+            self.quantum_started = asyncio.Event()
+            self.classical_started = asyncio.Event()
+
+        async def process_data(self, data):
+            self.classical_started.set()
+            await asyncio.wait_for(self.quantum_started.wait(), timeout=2.0)
+            return {"ethical_score": 0.85, "records": len(data["records"]), "flags": []}
+
+    def test_classical_prefix_runs_while_quantum_is_pending(self, monkeypatch):
+        """Test the classical prefix and quantum component wait on each other without deadlocking."""
+        # Arrange
+        core = self.RendezvousEthicalCore()
+        processor = qp.create_quantum_processor({"ethical_core": core})
+        original = processor._process_quantum_component
+
+        async def quantum(component):
+            core.quantum_started.set()
+            await asyncio.wait_for(core.classical_started.wait(), timeout=2.0)
+            return await original(component)
+
+        monkeypatch.setattr(processor, "_process_quantum_component", quantum)
+        task = self.hybrid_task()
+
+        # Act
+        result = asyncio.run(processor.process_task(task))
+
+        # Assert
+        assert processor.get_strategy_decision(task).strategy == "hybrid"
+        assert result.success, result.error_message
+        assert result.classical_result["ethical_score"] == 0.85
+
+    def test_overlapped_output_matches_sequential_path(self):
+        """Test the overlapped hybrid result equals running quantum then classical in sequence."""
+        # Arrange
+        processor = qp.create_quantum_processor({"ethical_core": self.RendezvousEthicalCore()})
+        task = self.hybrid_task()
+        processor.ethical_core.quantum_started.set()
+
+        async def sequential():
+            quantum = await processor._process_quantum_component(processor._extract_quantum_component(task))
+            classical = await processor._process_classical_component(
+                {**processor._extract_classical_component(task), "quantum_input": quantum}
+            )
+            return quantum, classical, processor._combine_quantum_classical_results(quantum, classical)
+
+        # Act
+        overlapped = asyncio.run(processor._process_hybrid(task))
+        quantum, classical, hybrid = asyncio.run(sequential())
+
+        # Assert
+        assert overlapped["quantum"] == quantum
+        assert overlapped["classical"] == classical
+        assert overlapped["hybrid"] == hybrid
+
+
+class TestStrategyDecision:
+    """Bounded classical size estimates and once-per-task strategy decisions."""
+
+    @pytest.mark.parametrize("payload", [
+        {"records": [{"id": i, "score": i / 7, "label": f"item-{i}", "flags": [True, None]} for i in range(40)]},
+        [[1.5, -2.25, 3.125] * 10, ["alpha", "beta", "gamma"], (1, 2, 3), {"nested": {"deeper": [0] * 50}}],
+        {"features": qp.np.linspace(0.0, 1.0, 64), "name": "weights"},
+    ])
+    def test_size_estimate_tracks_string_length(self, payload):
+        """Test the estimate is within the same order of magnitude as len(str(payload))."""
+        # Act
+        estimate = qp._estimate_serialized_size(payload, max_bytes=10 ** 9)
+
+        # Assert
+        assert 0.25 <= estimate / len(str(payload)) <= 4.0
+
+    def test_size_estimate_stops_at_cap(self):
+        """Test oversized payloads are reported at the cap."""
+        # Arrange
+        payload = {"rows": [[float(j) for j in range(100)] for _ in range(10000)]}
+
+        # Act
+        estimate = qp._estimate_serialized_size(payload)
+
+        # Assert
+        assert estimate == qp.CLASSICAL_SIZE_CAP
+
+    def test_decision_is_computed_once_per_task(self, monkeypatch):
+        """Test submission, execution and memo reuse share each task's single decision."""
+        # Arrange
+        processor = qp.create_quantum_processor({"seed": 1})
+        decided = []
+        original = processor._decide_processing_strategy
+
+        def counting(task):
+            decided.append(task.task_id)
+            return original(task)
+
+        monkeypatch.setattr(processor, "_decide_processing_strategy", counting)
+        first = qp.QuantumTask("first", qp.QuantumComputationType.SIMULATION, {}, {"num_qubits": 4}, max_qubits=10)
+        repeat = qp.QuantumTask("repeat", qp.QuantumComputationType.SIMULATION, {}, {"num_qubits": 4}, max_qubits=10)
+
+        async def run():
+            await processor.submit_task(first)
+            decision = first.strategy_decision
+            await processor.process_task(first)
+            await processor.process_task(repeat)
+            return decision
+
+        # Act
+        submitted = asyncio.run(run())
+
+        # Assert
+        assert decided == ["first", "repeat"]
+        assert first.strategy_decision is submitted
+        assert processor.get_strategy_decision(repeat) is repeat.strategy_decision
+        assert asyncio.run(processor.get_metrics())["memo"]["hits"] == 1
+
+
+class TestBackendRegistry:
+    """Capability index and load-aware routing over quantum backends."""
+
+    class FakeDevice:
+        """Backend exposing a Qiskit-style configuration and status."""
+
+        def __init__(self, num_qubits, gates, simulator=False, operational=True, pending_jobs=0):
+            self.config = SimpleNamespace(n_qubits=num_qubits, basis_gates=gates, simulator=simulator)
+            self.state = SimpleNamespace(operational=operational, pending_jobs=pending_jobs)
+
+        def configuration(self):
+            return self.config
+
+        def status(self):
+            return self.state
+
+    def test_capabilities_are_indexed_from_probes(self):
+        """Test the registry records each backend's limits and the largest operational qubit count."""
+        # Arrange
+        backends = {
+            "small": self.FakeDevice(5, ["cx", "rz", "sx"]),
+            "large": self.FakeDevice(27, ["cx", "rz", "sx"]),
+            "offline": self.FakeDevice(127, ["cx", "rz"], operational=False),
+        }
+
+        # Act
+        registry = qp.BackendRegistry(backends)
+        backends["extra"] = self.FakeDevice(40, ["cx"])
+        del backends["small"]
+        registry.refresh()
+
+        # Assert
+        assert set(registry.capabilities) == {"large", "offline", "extra"}
+        assert registry.capabilities["large"].gate_set == frozenset({"cx", "rz", "sx"})
+        assert registry.capabilities["large"].transpiles
+        assert not registry.capabilities["offline"].operational
+        assert registry.max_qubits == 40
+
+    def test_refresh_swaps_in_a_new_index(self):
+        """Test refresh publishes a new mapping and leaves the one being read untouched."""
+        # Arrange
+        class BrokenDevice:
+            def configuration(self):
+                raise ConnectionError("device unreachable")
+
+        backends = {"kept": self.FakeDevice(5, ["cx"]), "removed": self.FakeDevice(7, ["cx"])}
+        registry = qp.BackendRegistry(backends)
+        published = registry.capabilities
+        snapshot = dict(published)
+        del backends["removed"]
+        backends["kept"] = BrokenDevice()
+
+        # Act
+        registry.refresh()
+
+        # Assert
+        assert registry.capabilities is not published
+        assert published == snapshot and published["kept"].operational
+        assert set(registry.capabilities) == {"kept"}
+        assert not registry.capabilities["kept"].operational
+        assert registry.max_qubits == 0
+
+    def test_routing_respects_capabilities_and_load(self):
+        """Test circuits go to a capable backend, exact before approximate, least loaded first."""
+        # Arrange
+        processor = qp.create_quantum_processor({})
+        local = processor.backend_registry
+        devices = qp.BackendRegistry({
+            "first": self.FakeDevice(20, ["cx", "rz"], simulator=True),
+            "second": self.FakeDevice(20, ["cx", "rz"], simulator=True),
+        })
+
+        # Act
+        with devices.track("first"):
+            while_first_busy = devices.select_backend(10, {"cx"})
+        devices.throughput["first"] = 1e6
+        after_first_measured = devices.select_backend(10, {"cx"})
+
+        # Assert
+        assert local.select_backend(10, {"h", "cx"}, statevector=True) == "numpy_statevector"
+        assert local.select_backend(60, {"h", "cx"}) == "mps"
+        assert local.select_backend(10, approximate=True) == "mps"
+        assert local.select_backend(500) is None
+        assert devices.select_backend(30, {"cx"}) is None
+        assert while_first_busy == "second"
+        assert after_first_measured == "first"
+        assert devices.in_flight == {"first": 0}
+
+    def test_refresh_during_execution_keeps_load_counts(self):
+        """Test re-probing while a circuit is in flight neither loses nor misplaces its count."""
+        # Arrange
+        registry = qp.BackendRegistry({"device": self.FakeDevice(20, ["cx", "rz"])})
+
+        # Act
+        execution = registry.track("device")
+        execution.__enter__()
+        registry.refresh()
+        during = registry.snapshot()["device"]["in_flight"]
+        execution.__exit__(None, None, None)
+        registry.refresh()
+
+        # Assert
+        assert during == 1
+        assert registry.snapshot()["device"]["in_flight"] == 0
+        assert registry.snapshot()["device"]["throughput"] > 0
+
+
+class TestMPSSimulator:
+    """Matrix-product-state backend against the dense simulator."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        import numpy as np
+
+        self.np = np
+        self.dense = qp.NumpyStatevectorSimulator(max_qubits=12)
+
+    def test_matches_dense_statevector_including_distant_gates(self):
+        """Test an untruncated MPS reproduces the dense statevector."""
+        # Arrange
+        operations = [("h", (i,), None) for i in range(6)] + [
+            ("rx", (2,), 0.4), ("ry", (4,), 1.1), ("rzz", (1, 5), 0.7),
+            ("cx", (5, 0), None), ("cz", (0, 3), None), ("rz", (3,), 0.3),
+        ]
+
+        # Act
+        expected = self.dense.run(6, operations)[0]
+        state = qp.MPSSimulator(max_bond_dimension=64).run(6, operations)
+
+        # Assert
+        assert abs(self.np.vdot(expected, state.to_statevector())) ** 2 > 1 - 1e-10
+        assert state.truncation_error < 1e-12
+
+    def test_truncation_error_tracks_lost_fidelity(self):
+        """Test a capped bond dimension reports roughly the fidelity it loses."""
+        # Arrange
+        operations = qp._evolution_operations(10, 10)
+
+        # Act
+        expected = self.dense.run(10, operations)[0]
+        state = qp.MPSSimulator(max_bond_dimension=8).run(10, operations)
+        fidelity = abs(self.np.vdot(expected, state.to_statevector())) ** 2
+
+        # Assert
+        assert max(state.bond_dimensions) == 8
+        assert state.truncation_error > 0
+        assert abs((1 - fidelity) - state.truncation_error) < 0.5 * state.truncation_error
+
+    def test_large_simulation_routes_to_mps(self):
+        """Test a simulation beyond the dense limit runs on the MPS backend."""
+        # Arrange
+        processor = qp.create_quantum_processor({"numpy_max_qubits": 12})
+        task = qp.QuantumTask(
+            "wide", qp.QuantumComputationType.SIMULATION, {}, {"num_qubits": 60, "evolution_time": 0.5}, max_qubits=100
+        )
+
+        # Act
+        result = asyncio.run(processor.process_task(task))
+
+        # Assert
+        assert result.success
+        assert result.quantum_result["backend"] == "mps"
+        assert len(result.quantum_result["mps_tensors"]) == 60
+
+
+class TestStatevectorCheckpoints:
+    """Prefix checkpoints for evolution-time sweeps."""
+
+    def test_sweep_resumes_from_longest_cached_prefix(self):
+        """Test each longer run resumes from the previous one and matches a fresh run."""
+        # Arrange
+        import numpy as np
+
+        simulator = qp.NumpyStatevectorSimulator(max_qubits=10)
+        checkpoints = qp.StatevectorCheckpoints()
+
+        # Act
+        states = [
+            simulator.run_segments(6, qp._evolution_segments(6, steps), checkpoints)[0]
+            for steps in (2, 5, 9)
+        ]
+
+        # Assert
+        for steps, state in zip((2, 5, 9), states):
+            assert np.allclose(state, simulator.run(6, qp._evolution_operations(6, steps))[0])
+        assert checkpoints.get_stats()["hits"] == 2
+        assert len(checkpoints) == 10
+
+    def test_cache_is_bounded_by_bytes(self):
+        """Test least recently used checkpoints are evicted past the byte limit."""
+        # Arrange
+        simulator = qp.NumpyStatevectorSimulator(max_qubits=10)
+        checkpoints = qp.StatevectorCheckpoints(max_bytes=3 * 2 ** 6 * 16)
+
+        # Act
+        simulator.run_segments(6, qp._evolution_segments(6, 8), checkpoints)
+
+        # Assert
+        assert len(checkpoints) == 3
+        assert checkpoints.nbytes <= checkpoints.max_bytes
+        assert checkpoints.get_stats()["evictions"] == 6
+
+    def test_concurrent_stores_of_one_key_count_once(self):
+        """Test threads storing the same prefix at once keep a single entry and consistent byte count."""
+        # Arrange
+        import threading
+
+        checkpoints = qp.StatevectorCheckpoints()
+        state = qp.np.ones(2 ** 12, dtype=qp.np.complex128)
+        start = threading.Barrier(8)
+
+        def store():
+            start.wait()
+            for i in range(50):
+                checkpoints.put(f"prefix-{i}", state)
+
+        threads = [threading.Thread(target=store) for _ in range(8)]
+
+        # Act
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        checkpoints.clear()
+
+        # Assert
+        stats = checkpoints.get_stats()
+        assert stats["stores"] == 50
+        assert stats["entries"] == 0 and stats["bytes"] == 0
+
+
+class TestSharedStatevectors:
+    """Worker simulations handed back through memory-mapped statevectors."""
+
+    def test_worker_statevector_is_mapped_not_copied(self, tmp_path):
+        """Test a worker simulation returns a mapping of its output file and leaves no file behind."""
+        # Arrange
+        import mmap
+
+        import numpy as np
+
+        processor = qp.create_quantum_processor({
+            "seed": 1,
+            "simulation_workers": 1,
+            "shared_statevector_min_qubits": 4,
+            "shared_statevector_dir": str(tmp_path),
+        })
+        task = qp.QuantumTask("w", qp.QuantumComputationType.SIMULATION, {}, {"num_qubits": 5, "evolution_time": 0.3})
+
+        async def run():
+            try:
+                return await processor.process_task(task)
+            finally:
+                await processor.stop()
+
+        # Act
+        result = asyncio.run(run())
+        statevector = result.quantum_result["final_statevector"]
+
+        # Assert
+        expected = qp.NumpyStatevectorSimulator().run(5, qp._evolution_operations(5, 3))[0]
+        assert np.allclose(statevector, expected)
+        base = statevector
+        while not isinstance(base, mmap.mmap):
+            base = base.base
+        assert list(tmp_path.iterdir()) == []
+
+
+    def test_segments_run_in_place_on_mapped_statevector(self, tmp_path):
+        """Test run_segments with out= holds the state in the memory map and matches a private run."""
+        # Arrange
+        import numpy as np
+
+        simulator = qp.NumpyStatevectorSimulator()
+        segments = qp._evolution_segments(5, 3)
+        checkpoints = qp.StatevectorCheckpoints()
+        simulator.run_segments(5, segments[:2], checkpoints)
+        path = qp.allocate_shared_statevector(str(tmp_path), 5, np.complex128)
+        mapped = np.memmap(path, dtype=np.complex128, mode="r+", shape=(32,))
+
+        # Act
+        state = simulator.run_segments(5, segments, checkpoints, out=mapped)
+
+        # Assert
+        assert np.shares_memory(state, mapped)
+        assert np.allclose(mapped, simulator.run_segments(5, segments)[0])
+        with pytest.raises(ValueError):
+            simulator.run_segments(5, segments, out=np.zeros(16, dtype=np.complex128))
+
+    def test_worker_processes_are_forked_before_engine_threads(self, tmp_path, monkeypatch):
+        """Test worker pools fork during construction, before the journal writer thread starts."""
+        # Arrange
+        import multiprocessing
+
+        original = qp.TaskJournal.__init__
+        children_at_journal = []
+
+        def recording(journal, *args, **kwargs):
+            children_at_journal.append({child.pid for child in multiprocessing.active_children()})
+            original(journal, *args, **kwargs)
+
+        monkeypatch.setattr(qp.TaskJournal, "__init__", recording)
+
+        # Act
+        processor = qp.create_quantum_processor({
+            "simulation_workers": 2,
+            "qaoa_gradient_workers": 2,
+            "journal_path": str(tmp_path / "journal.db"),
+        })
+        workers = set(processor._simulation_executor._processes) | set(processor._gradient_executor._processes)
+        asyncio.run(processor.stop())
+        processor.journal.close()
+
+        # Assert
+        assert len(workers) == 4
+        assert len(children_at_journal) == 1 and workers <= children_at_journal[0]
+        assert isinstance(processor._get_simulation_executor(), qp.ThreadPoolExecutor)
+
+class TestResultAnchoring:
+    """Merkle-batched anchoring of high-confidence results."""
+
+    def test_batch_is_anchored_once_with_inclusion_proofs(self):
+        """Test one root is anchored per batch and every result gets a verifying proof."""
+        # Arrange
+        anchor = qp.LocalResultAnchor()
+        anchorer = qp.ResultAnchorer(anchor, window=0.01)
+        results = [
+            qp.QuantumResult(f"t{i}", True, {"energy": -float(i)}, None, None, 0.1, 3, 0, confidence_score=0.9)
+            for i in range(5)
+        ]
+
+        async def run():
+            proofs = await asyncio.gather(*(anchorer.submit(result) for result in results))
+            return results, proofs
+
+        # Act
+        results, proofs = asyncio.run(run())
+
+        # Assert
+        assert len(anchor.receipts) == 1
+        assert {proof.root for proof in proofs} == {anchor.receipts[0]["root"]}
+        assert all(proof.verify(result) for proof, result in zip(proofs, results))
+        assert not proofs[0].verify(results[1])
+        assert anchorer.proof("t3") is proofs[3]
+
+    def test_failed_anchor_call_is_retried_next_window(self):
+        """Test a batch whose anchor call fails is anchored on a later attempt."""
+        # Arrange
+        class FlakyAnchor(qp.LocalResultAnchor):
+            async def anchor_merkle_root(self, root, metadata):
+                if not self.receipts and not getattr(self, "failed", False):
+                    self.failed = True
+                    raise ConnectionError("anchor unavailable")
+                return await super().anchor_merkle_root(root, metadata)
+
+        anchorer = qp.ResultAnchorer(FlakyAnchor(), window=0.01)
+        result = qp.QuantumResult("r", True, {"value": 1}, None, None, 0.1, 1, 0, confidence_score=0.9)
+
+        async def run():
+            return await anchorer.submit(result)
+
+        # Act
+        proof = asyncio.run(run())
+
+        # Assert
+        assert proof.verify(result)
+        assert anchorer.get_stats()["failed_calls"] == 1
+
+    def test_unencodable_result_fails_alone(self):
+        """Test a payload the binary format cannot encode fails its own proof and the batch is anchored."""
+        # Arrange
+        anchor = qp.LocalResultAnchor()
+        anchorer = qp.ResultAnchorer(anchor, window=0.01)
+        results = [
+            qp.QuantumResult("good-1", True, {"value": 1}, None, None, 0.1, 1, 0, confidence_score=0.9),
+            qp.QuantumResult("bad", True, {"labels": {"a", "b"}}, None, None, 0.1, 1, 0, confidence_score=0.9),
+            qp.QuantumResult("good-2", True, {"value": 2}, None, None, 0.1, 1, 0, confidence_score=0.9),
+        ]
+
+        async def run():
+            return await asyncio.gather(*(anchorer.submit(result) for result in results), return_exceptions=True)
+
+        # Act
+        good_1, bad, good_2 = asyncio.run(run())
+
+        # Assert
+        assert isinstance(bad, TypeError)
+        assert good_1.verify(results[0]) and good_2.verify(results[2])
+        assert good_1.root == good_2.root == anchor.receipts[0]["root"]
+        assert anchorer.get_stats()["dropped"] == 1
+
+
+class TestResultsStore:
+    """Bounded, expiring result storage with an on-disk spill tier."""
+
+    @staticmethod
+    def result(task_id, amplitudes=8):
+        statevector = qp.np.arange(amplitudes, dtype=qp.np.complex128)
+        return qp.QuantumResult(task_id, True, {"statevector": statevector, "energy": -1.0}, None, None, 0.1, 3, 0)
+
+    def test_eviction_by_entry_count_and_bytes(self):
+        """Test the least recently used results are evicted once either limit is exceeded."""
+        # Arrange
+        by_count = qp.ResultsStore(max_entries=2, ttl=None)
+        by_bytes = qp.ResultsStore(max_bytes=3 * qp._result_nbytes(self.result("x", 1024)), ttl=None)
+
+        # Act
+        for task_id in ("a", "b", "c"):
+            by_count.put(task_id, self.result(task_id))
+        by_count.get("b")
+        by_count.put("d", self.result("d"))
+        for task_id in ("a", "b", "c", "d"):
+            by_bytes.put(task_id, self.result(task_id, 1024))
+
+        # Assert
+        assert "a" not in by_count and "c" not in by_count
+        assert "b" in by_count and "d" in by_count
+        assert by_count.get_stats()["evictions"] == 2
+        assert "a" not in by_bytes and "d" in by_bytes
+        assert by_bytes.memory_bytes <= by_bytes.max_bytes
+
+    def test_expired_results_are_dropped(self):
+        """Test results older than the TTL miss on read and are removed by purge_expired."""
+        # Arrange
+        store = qp.ResultsStore(ttl=60.0)
+        store.put("old", self.result("old"))
+        store.put("stale", self.result("stale"))
+        store.put("fresh", self.result("fresh"))
+        store._memory["old"].stored_at -= 120
+        store._memory["stale"].stored_at -= 120
+
+        # Act
+        missed = store.get("old")
+        purged = store.purge_expired()
+
+        # Assert
+        assert missed is None
+        assert purged == 1
+        assert len(store) == 1 and store.get("fresh") is not None
+        assert store.get_stats()["expirations"] == 2
+
+    def test_spilled_results_reload_through_mmap(self, tmp_path):
+        """Test a large evicted result is written as .npy files and memory-mapped back on read."""
+        # Arrange
+        store = qp.ResultsStore(max_entries=1, ttl=None, spill_dir=str(tmp_path), spill_threshold_bytes=0)
+        first = self.result("first", 1024)
+
+        # Act
+        store.put("first", first)
+        store.put("second", self.result("second", 1024))
+        loaded = store.get("first")
+
+        # Assert
+        assert list(tmp_path.rglob("*.npy"))
+        statevector = loaded.quantum_result["statevector"]
+        assert isinstance(statevector, qp.np.memmap)
+        assert qp.np.array_equal(statevector, first.quantum_result["statevector"])
+        assert loaded.quantum_result["energy"] == -1.0
+        stats = store.get_stats()
+        assert stats["spills"] == 1 and stats["disk_hits"] == 1
+        assert stats["memory_entries"] == 1 and stats["disk_entries"] == 1
+        assert stats["disk_bytes"] > 0
+
+    def test_spill_tier_is_bounded(self, tmp_path):
+        """Test the oldest spilled results are deleted once the spill tier exceeds spill_max_bytes."""
+        # Arrange
+        entry_bytes = qp._result_nbytes(self.result("x", 1024))
+        store = qp.ResultsStore(max_entries=1, ttl=None, spill_dir=str(tmp_path), spill_threshold_bytes=0,
+                                spill_max_bytes=int(entry_bytes * 1.5))
+
+        # Act
+        for task_id in ("a", "b", "c"):
+            store.put(task_id, self.result(task_id, 1024))
+
+        # Assert
+        assert "a" not in store
+        assert store.get("b") is not None
+        assert store.disk_bytes <= store.spill_max_bytes
+        assert len([path for path in tmp_path.iterdir() if path.is_dir()]) == 1
+
+
+class TestResultSerialization:
+    """Binary result format round trips."""
+
+    @staticmethod
+    def result(dtype):
+        statevector = (qp.np.arange(16) + 1j * qp.np.arange(16)[::-1]).astype(dtype)
+        counts = qp.SparseCounts.from_dict({"0011": 7, "1100": 3, "0000": 1})
+        return qp.QuantumResult(
+            "r", True,
+            {"statevector": statevector, "counts": counts, "nested": {"energy": -1.25, "phase": 0.5 + 0.25j,
+                                                                      "bits": [0, 1, 1], "label": "ground"}},
+            {"ethical_score": 0.9}, None, 0.3, 4, 11, confidence_score=0.7
+        )
+
+    @pytest.mark.parametrize("dtype", ["complex64", "complex128"])
+    def test_round_trip_preserves_payloads(self, dtype):
+        """Test statevectors, counts and nested dicts survive to_bytes/from_bytes unchanged."""
+        # Arrange
+        result = self.result(qp.np.dtype(dtype))
+
+        # Act
+        decoded = qp.QuantumResult.from_bytes(result.to_bytes())
+
+        # Assert
+        statevector = decoded.quantum_result["statevector"]
+        assert statevector.dtype == qp.np.dtype(dtype)
+        assert qp.np.array_equal(statevector, result.quantum_result["statevector"])
+        assert decoded.quantum_result["counts"].to_dict() == {"0000": 1, "0011": 7, "1100": 3}
+        assert decoded.quantum_result["nested"] == result.quantum_result["nested"]
+        assert decoded.classical_result == {"ethical_score": 0.9}
+        assert (decoded.task_id, decoded.shots_executed, decoded.confidence_score) == ("r", 11, 0.7)
+
+    def test_arrays_are_aligned_zero_copy_views(self):
+        """Test encoded arrays start on 64-byte boundaries and decode as views into the buffer."""
+        # Arrange
+        result = self.result(qp.np.complex128)
+        buffers = result.to_buffers()
+        data = bytearray(b"".join(buffers))
+
+        # Act
+        decoded = qp.QuantumResult.from_bytes(data)
+
+        # Assert
+        starts = qp.np.cumsum([0] + [len(buffer) for buffer in buffers[:-1]])
+        assert all(start % 64 == 0 for start, buffer in zip(starts, buffers) if isinstance(buffer, memoryview))
+        assert qp.np.shares_memory(buffers[1].obj, result.quantum_result["statevector"])
+        statevector = decoded.quantum_result["statevector"]
+        base = qp.np.frombuffer(data, dtype=qp.np.uint8)
+        offset = statevector.__array_interface__["data"][0] - base.__array_interface__["data"][0]
+        assert offset % 64 == 0
+        assert qp.np.shares_memory(statevector, base)
+
+    def test_bad_magic_and_truncation_are_rejected(self):
+        """Test foreign or cut-off buffers raise ValueError."""
+        # Arrange
+        data = self.result(qp.np.complex128).to_bytes()
+
+        # Act / Assert
+        with pytest.raises(ValueError):
+            qp.QuantumResult.from_bytes(b"XXXX" + data[4:])
+        for length in (3, 40, len(data) - 100):
+            with pytest.raises(ValueError):
+                qp.QuantumResult.from_bytes(data[:length])
+
+
+class TestCompactResults:
+    """Slotted result records, hybrid references and lazily decoded payloads."""
+
+    def test_hybrid_result_references_its_components(self):
+        """Test the hybrid payload points at the quantum and classical payloads instead of copying them."""
+        # Arrange
+        processor = qp.create_quantum_processor({})
+        quantum = {"quantum_advantage": 0.8, "qubits_used": 4}
+        classical = {"ethical_score": 0.9}
+        hybrid = processor._combine_quantum_classical_results(quantum, classical)
+        result = qp.QuantumResult("h", True, quantum, classical, hybrid, 0.1, 4, 0, confidence_score=0.8)
+
+        # Act
+        decoded = qp.QuantumResult.from_bytes(result.to_bytes())
+        combined = decoded.resolve(decoded.hybrid_result["combined_result"])
+
+        # Assert
+        assert not hasattr(result, "__dict__")
+        assert combined == {"quantum_component": quantum, "classical_component": classical}
+        with pytest.raises(AttributeError):
+            result.success = False
+
+    def test_store_keeps_payloads_encoded_until_read(self):
+        """Test the memory tier holds LazyPayloads and returns equal results with arrays shared."""
+        # Arrange
+        store = qp.ResultsStore(ttl=None)
+        statevector = qp.np.arange(8, dtype=qp.np.complex128)
+        result = qp.QuantumResult(
+            "s", True, {"statevector": statevector, "energy": -1.5, "bits": [0, 1]}, None, None, 0.1, 3, 0
+        )
+
+        # Act
+        store.put("s", result)
+        stored = store._memory["s"].result
+        loaded = store.get("s")
+
+        # Assert
+        assert isinstance(stored.quantum_result, qp.LazyPayload)
+        assert loaded.quantum_result["energy"] == -1.5
+        assert loaded.quantum_result["bits"] == [0, 1]
+        assert qp.np.shares_memory(loaded.quantum_result["statevector"], statevector)
+
+
+class TestProgressStreaming:
+    """Progress events and early stopping through stream_task."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.processor = qp.create_quantum_processor({"seed": 1, "progress_interval": 0.0})
+
+    def test_simulation_streams_steps_then_result(self):
+        """Test a streamed simulation reports every evolution step and ends with its result."""
+        # Arrange
+        task = qp.QuantumTask("s", qp.QuantumComputationType.SIMULATION, {}, {"num_qubits": 6, "evolution_time": 0.5})
+
+        async def run():
+            await self.processor.submit_task(task)
+            return [event async for event in self.processor.stream_task("s")]
+
+        # Act
+        events = asyncio.run(run())
+
+        # Assert
+        assert events[0].event == "started"
+        assert [event.iteration for event in events if event.event == "step"] == [1, 2, 3, 4, 5, 6]
+        assert events[-1].event == "completed" and events[-1].result.success
+
+    def test_closing_stream_early_cancels_the_run(self):
+        """Test leaving a variational run's stream stops the run and frees its reservation."""
+        # Arrange
+        import contextlib
+
+        task = qp.QuantumTask(
+            "q", qp.QuantumComputationType.OPTIMIZATION, {},
+            {"num_qubits": 6, "num_layers": 2, "optimizer": "ADAM", "max_iterations": 500}, max_qubits=10
+        )
+
+        async def run():
+            await self.processor.submit_task(task)
+            energies = []
+            async with contextlib.aclosing(self.processor.stream_task("q")) as stream:
+                async for event in stream:
+                    if event.event == "iteration":
+                        energies.append(event.best_energy)
+                    if len(energies) == 3:
+                        break
+            await asyncio.sleep(0.1)
+            return energies
+
+        # Act
+        energies = asyncio.run(run())
+
+        # Assert
+        assert energies == sorted(energies, reverse=True)
+        assert self.processor.admission.reserved_bytes == 0
+        assert "q" not in self.processor.active_tasks
+        assert self.processor.results_store.get("q") is None
+
+
+    def test_streamed_task_is_not_run_again_by_queue_consumer(self):
+        """Test a task started by its stream leaves the queue, so draining the queue runs nothing twice."""
+        # Arrange
+        processor = qp.create_quantum_processor({"progress_interval": 0.0, "memo_policies": {"simulation": "off"}})
+        task = qp.QuantumTask("c", qp.QuantumComputationType.SIMULATION, {}, {"num_qubits": 4})
+        other = qp.QuantumTask("s", qp.QuantumComputationType.SIMULATION, {}, {"num_qubits": 4})
+        consumed = []
+
+        async def consume():
+            while True:
+                queued = await processor.task_queue.get()
+                try:
+                    consumed.append(queued.task_id)
+                    await processor.process_task(queued)
+                finally:
+                    processor.task_queue.task_done()
+
+        async def run():
+            await processor.submit_task(task)
+            await processor.submit_task(other)
+            events = [event async for event in processor.stream_task("c")]
+            consumer = asyncio.get_running_loop().create_task(consume())
+            await asyncio.wait_for(processor.task_queue.join(), 10)
+            consumer.cancel()
+            return events, await processor.get_metrics()
+
+        # Act
+        events, metrics = asyncio.run(run())
+
+        # Assert
+        assert events[-1].event == "completed"
+        assert consumed == ["s"]
+        assert metrics["tasks_processed"] == 2
+
+class TestProfiling:
+    """Stage spans, hooks and trace export of TaskProfiler."""
+
+    def test_stages_are_spanned_hooked_and_exported(self, tmp_path):
+        """Test a task's stages nest in its task span, run hooks and export as Chrome trace events."""
+        # Arrange
+        processor = qp.create_quantum_processor({"profiling": True})
+        entered, finished = [], []
+        processor.profiler.add_hook(pre=lambda task_id, stage, args: entered.append(stage),
+                                    post=finished.append, stages=["simulate"])
+        task = qp.QuantumTask("p", qp.QuantumComputationType.SIMULATION, {}, {"num_qubits": 4, "evolution_time": 0.2})
+
+        # Act
+        asyncio.run(processor.process_task(task))
+        trace = processor.profiler.export_chrome_trace(str(tmp_path / "trace.json"))
+
+        # Assert
+        spans = {span.stage: span for span in processor.profiler.get_spans("p")}
+        assert {"task", "strategy", "circuit_build", "simulate", "finalize"} <= set(spans)
+        root = spans["task"]
+        assert all(root.start <= span.start and span.start + span.duration <= root.start + root.duration
+                   for span in spans.values())
+        assert entered == ["simulate"]
+        assert finished[0].args == {"backend": "numpy_statevector", "qubits": 4}
+        names = {event["args"]["name"] for event in trace["traceEvents"] if event["ph"] == "M"}
+        assert names == {"p"}
+        assert json.loads((tmp_path / "trace.json").read_text()) == trace
+
+    def test_disabled_profiler_records_nothing_and_sampling_captures_profiles(self):
+        """Test the disabled profiler hands out the shared no-op span; sampled tasks get cProfile output."""
+        # Arrange
+        disabled = qp.create_quantum_processor({})
+        sampled = qp.create_quantum_processor({"profiling": True, "profile_sample_rate": 1.0,
+                                               "profile_cprofile": True, "profile_memory": True})
+        task = qp.QuantumTask("s", qp.QuantumComputationType.SIMULATION, {}, {"num_qubits": 3, "evolution_time": 0.1})
+
+        # Act
+        asyncio.run(disabled.process_task(task))
+        asyncio.run(sampled.process_task(task))
+
+        # Assert
+        assert disabled.profiler.stage("simulate") is disabled.profiler.task(task)
+        assert len(disabled.profiler.spans) == 0
+        assert "_quantum_simulation" in sampled.profiler.profiles["s"]
+        root = sampled.profiler.get_spans("s")[-1]
+        assert root.stage == "task"
+        assert root.args["memory_peak_bytes"] > 0
+
+
+class TestTaskDistribution:
+    """Coordinator/worker mode over local sockets."""
+
+    @staticmethod
+    def simulation(task_id, evolution_time=0.5):
+        return qp.QuantumTask(
+            task_id, qp.QuantumComputationType.SIMULATION, {}, {"num_qubits": 6, "evolution_time": evolution_time}
+        )
+
+    def test_worker_processes_complete_every_task(self, tmp_path):
+        """Test tasks submitted to the coordinator are run by worker processes."""
+        # Arrange
+        import multiprocessing
+
+        coordinator = td.TaskCoordinator(f"unix:{tmp_path / 'coordinator.sock'}")
+        context = multiprocessing.get_context("fork")
+
+        async def run():
+            address = await coordinator.start()
+            workers = [
+                context.Process(target=td.run_engine_worker, args=(address, {"seed": 1}), kwargs={"worker_id": f"w{i}"})
+                for i in range(2)
+            ]
+            for worker in workers:
+                worker.start()
+            try:
+                await coordinator.wait_for_workers(2, timeout=30)
+                results = await asyncio.gather(
+                    *(coordinator.submit(self.simulation(f"t{i}", 0.1 * i)) for i in range(6))
+                )
+                return results, coordinator.get_stats()
+            finally:
+                await coordinator.stop()
+                for worker in workers:
+                    worker.join(10)
+
+        # Act
+        results, stats = asyncio.run(run())
+
+        # Assert
+        assert [result.task_id for result in results] == [f"t{i}" for i in range(6)]
+        assert all(result.success for result in results)
+        assert sorted(stats["workers"]) == ["w0", "w1"]
+        assert sum(worker["completed"] for worker in stats["workers"].values()) == 6
+
+    def test_silent_worker_tasks_are_reassigned(self):
+        """Test a worker that stops heartbeating loses its task to another worker."""
+        # Arrange
+        coordinator = td.TaskCoordinator(heartbeat_timeout=0.3)
+        processor = qp.create_quantum_processor({"seed": 1})
+
+        async def run():
+            address = await coordinator.start()
+            reader, writer = await td._open_connection(address)
+            writer.write(td._frame({"type": "register", "worker_id": "silent", "capabilities": {}}))
+            writer.write(td._frame({"type": "pull", "slots": 1}))
+            result = coordinator.submit(self.simulation("t"))
+            header, _ = await td._read_frame(reader)
+
+            worker = asyncio.get_running_loop().create_task(
+                td.EngineWorker(processor, address, worker_id="live", heartbeat_interval=0.05).run()
+            )
+            try:
+                return header, await asyncio.wait_for(result, 10), coordinator.get_stats()
+            finally:
+                await coordinator.stop()
+                await worker
+                writer.close()
+
+        # Act
+        header, result, stats = asyncio.run(run())
+
+        # Assert
+        assert header == {"type": "tasks", "count": 1}
+        assert result.success
+        assert stats["reassigned"] == 1
+        assert stats["workers_lost"] == 1
+
+    def test_worker_reports_unexpected_errors_as_failed_results(self):
+        """Test an exception escaping a worker's processing still resolves the task."""
+        # Arrange
+        coordinator = td.TaskCoordinator()
+        processor = qp.create_quantum_processor({"seed": 1})
+
+        async def broken(task):
+            raise RuntimeError("engine fault")
+
+        processor.process_task = broken
+
+        async def run():
+            address = await coordinator.start()
+            worker = asyncio.get_running_loop().create_task(
+                td.EngineWorker(processor, address, worker_id="w", heartbeat_interval=0.05).run()
+            )
+            try:
+                return await asyncio.wait_for(coordinator.submit(self.simulation("t")), 10), coordinator.get_stats()
+            finally:
+                await coordinator.stop()
+                await worker
+
+        # Act
+        result, stats = asyncio.run(run())
+
+        # Assert
+        assert not result.success
+        assert result.error_message == "engine fault"
+        assert stats["workers"]["w"]["completed"] == 1
+
+    def test_register_frame_without_worker_id_closes_connection(self):
+        """Test a malformed register frame is rejected instead of raising KeyError."""
+        # Arrange
+        coordinator = td.TaskCoordinator()
+
+        async def run():
+            address = await coordinator.start()
+            reader, writer = await td._open_connection(address)
+            writer.write(td._frame({"type": "register", "capabilities": {}}))
+            try:
+                closed = await asyncio.wait_for(reader.read(), 5)
+                return closed, coordinator.get_stats()
+            finally:
+                writer.close()
+                await coordinator.stop()
+
+        # Act
+        closed, stats = asyncio.run(run())
+
+        # Assert
+        assert closed == b""
+        assert stats["workers"] == {}
+
+
+    def test_task_batches_round_trip_without_pickle(self):
+        """Test task frames carry fields, nested parameters and arrays, and pickled bodies are refused."""
+        # Arrange
+        import pickle
+
+        weights = qp.np.arange(6, dtype=qp.np.float32).reshape(2, 3)
+        task = qp.QuantumTask(
+            "t", qp.QuantumComputationType.OPTIMIZATION, {"weights": weights, "phase": 1 + 2j},
+            {"num_qubits": 4, "cost_function": {"edges": [[0, 1], [1, 2]]}}, priority=3, shots=128, timeout=9.0
+        )
+
+        # Act
+        decoded, = td._decode_tasks(b"".join(td._encode_tasks([task])))
+
+        # Assert
+        assert decoded.quantum_parameters == task.quantum_parameters
+        assert decoded.classical_data["phase"] == 1 + 2j
+        assert (decoded.task_type, decoded.priority, decoded.shots, decoded.timeout, decoded.created_at) == (
+            task.task_type, 3, 128, 9.0, task.created_at
+        )
+        assert decoded.classical_data["weights"].dtype == qp.np.float32
+        assert qp.np.array_equal(decoded.classical_data["weights"], weights)
+        with pytest.raises(ValueError):
+            td._decode_tasks(pickle.dumps([task]))
+
+    def test_submit_refuses_tasks_that_cannot_be_sent(self):
+        """Test a task whose parameters have no wire encoding fails at submit."""
+        # Arrange
+        coordinator = td.TaskCoordinator()
+        task = qp.QuantumTask("t", qp.QuantumComputationType.SIMULATION, {"labels": {"a"}}, {"num_qubits": 2})
+
+        async def run():
+            coordinator.submit(task)
+
+        # Act / Assert
+        with pytest.raises(TypeError):
+            asyncio.run(run())
+        assert coordinator.get_stats()["submitted"] == 0
+
+class TestAdmissionControl:
+    """Memory-budgeted admission of tasks."""
+
+    def test_reservations_queue_until_memory_is_released(self):
+        """Test a reservation that does not fit waits for an earlier one to finish."""
+        # Arrange
+        controller = qp.AdmissionController(budget_bytes=100)
+        order = []
+
+        async def hold(name, nbytes, seconds):
+            async with controller.reserve(qp.TaskFootprint(nbytes, 0.0)):
+                order.append(name)
+                await asyncio.sleep(seconds)
+
+        async def run():
+            await asyncio.gather(hold("first", 80, 0.02), hold("second", 40, 0.0))
+
+        # Act
+        asyncio.run(run())
+
+        # Assert
+        assert order == ["first", "second"]
+        assert controller.get_stats()["queued"] == 1
+        assert controller.reserved_bytes == 0
+
+    def test_oversized_task_is_rejected(self):
+        """Test a reservation larger than the whole budget raises AdmissionError."""
+        # Arrange
+        controller = qp.AdmissionController(budget_bytes=100)
+
+        # Act / Assert
+        with pytest.raises(qp.AdmissionError):
+            asyncio.run(controller.acquire(101))
+
+    def test_oversized_simulation_is_downgraded_to_mps(self):
+        """Test a dense simulation over budget runs on the approximate backend instead."""
+        # Arrange
+        processor = qp.create_quantum_processor({"memory_budget_bytes": 16 * 1024 ** 2})
+        task = qp.QuantumTask(
+            "big", qp.QuantumComputationType.SIMULATION, {}, {"num_qubits": 20, "evolution_time": 0.2}, max_qubits=100
+        )
+
+        # Act
+        dense = processor.estimate_footprint(task)
+        result = asyncio.run(processor.process_task(task))
+
+        # Assert
+        assert dense.backend == "numpy_statevector"
+        assert dense.memory_bytes > 16 * 1024 ** 2
+        assert result.success
+        assert result.quantum_result["backend"] == "mps"
+        assert processor.admission.get_stats()["downgraded"] == 1
+
+
+class TestDeadlineScheduling:
+    """Earliest-deadline-first scheduling, preemption and deadline enforcement."""
+
+    @staticmethod
+    def variational(task_id, timeout=60.0, max_iterations=300):
+        return qp.QuantumTask(
+            task_id, qp.QuantumComputationType.OPTIMIZATION, {},
+            {"num_qubits": 6, "num_layers": 2, "optimizer": "ADAM", "max_iterations": max_iterations},
+            max_qubits=10, timeout=timeout
+        )
+
+    @staticmethod
+    def simulation(task_id, timeout=300.0, priority=1):
+        return qp.QuantumTask(
+            task_id, qp.QuantumComputationType.SIMULATION, {}, {"num_qubits": 4, "evolution_time": 0.1},
+            priority=priority, timeout=timeout
+        )
+
+    def test_queue_hands_out_earliest_weighted_deadline_first(self):
+        """Test the task queue orders by deadline, pulled earlier by priority, FIFO among equals."""
+        # Arrange
+        queue = qp.DeadlineQueue()
+        tasks = [
+            self.simulation("late", timeout=300.0),
+            self.simulation("soon", timeout=10.0),
+            self.simulation("urgent", timeout=300.0, priority=100),
+            self.simulation("soon-again", timeout=10.0),
+        ]
+
+        async def drain():
+            for task in tasks:
+                await queue.put(task)
+            return [(await queue.get()).task_id for _ in tasks]
+
+        # Act
+        order = asyncio.run(drain())
+
+        # Assert
+        assert order == ["urgent", "soon", "soon-again", "late"]
+
+    def test_urgent_task_preempts_variational_run(self):
+        """Test a waiting urgent task takes the only slot at the next iteration boundary."""
+        # Arrange
+        processor = qp.create_quantum_processor({"max_concurrent_tasks": 1})
+        finished = []
+
+        async def run(task):
+            result = await processor.process_task(task)
+            finished.append(task.task_id)
+            return result
+
+        async def scenario():
+            batch = asyncio.create_task(run(self.variational("batch")))
+            await asyncio.sleep(0.2)
+            urgent = await run(self.simulation("urgent", timeout=2.0))
+            return urgent, await batch
+
+        # Act
+        urgent, batch = asyncio.run(scenario())
+
+        # Assert
+        assert urgent.success and batch.success
+        assert finished == ["urgent", "batch"]
+        stats = processor.scheduler.get_stats()
+        assert stats["preemptions"] >= 1
+        assert stats["running"] == stats["waiting"] == 0
+
+    def test_timeout_is_enforced(self):
+        """Test a run still going at its deadline is stopped and counted as a miss."""
+        # Arrange
+        processor = qp.create_quantum_processor({})
+        task = self.variational("slow", timeout=0.3, max_iterations=100000)
+
+        # Act
+        result = asyncio.run(processor.process_task(task))
+
+        # Assert
+        assert not result.success
+        assert "deadline" in result.error_message
+        assert processor.scheduler.get_stats()["deadline_misses"] == 1
+        assert processor.admission.reserved_bytes == 0
+
+    def test_joining_task_is_held_to_its_own_deadline(self):
+        """Test a task joining an identical in-flight run fails at its own, tighter deadline."""
+        # Arrange
+        processor = qp.create_quantum_processor({})
+        leader = self.variational("leader", timeout=2.0, max_iterations=100000)
+        joiner = self.variational("joiner", timeout=0.3, max_iterations=100000)
+
+        async def run():
+            leading = asyncio.get_running_loop().create_task(processor.process_task(leader))
+            await asyncio.sleep(0.05)
+            started = time.perf_counter()
+            joined = await processor.process_task(joiner)
+            waited = time.perf_counter() - started
+            misses = processor.scheduler.get_stats()["deadline_misses"]
+            leader_done = leading.done()
+            leading.cancel()
+            await asyncio.gather(leading, return_exceptions=True)
+            return joined, waited, leader_done, misses
+
+        # Act
+        joined, waited, leader_done, misses = asyncio.run(run())
+
+        # Assert
+        assert not joined.success
+        assert "joining an identical task" in joined.error_message
+        assert waited < 1.0 and not leader_done
+        assert "joiner" not in processor.active_tasks
+        assert misses == 1
+
+    def test_infeasible_task_is_rejected_at_submission(self):
+        """Test a task whose measured service time exceeds its timeout is turned away."""
+        # Arrange
+        processor = qp.create_quantum_processor({})
+        warmup = self.simulation("warmup")
+        asyncio.run(processor.process_task(warmup))
+        service = processor.scheduler.estimate(warmup)
+
+        # Act / Assert
+        with pytest.raises(qp.DeadlineError):
+            asyncio.run(processor.submit_task(self.simulation("tight", timeout=service / 10)))
+        assert processor.scheduler.get_stats()["rejected"] == 1
+        assert "tight" not in processor.active_tasks